@@ -4,6 +4,22 @@
 
 import argparse
 import os
+import re
+import sys
+import time
+from array import array
+from collections import namedtuple
+
+def parse_time(text: str) -> float:
+    "Turn seconds since the epoch or a local ISO date and time into seconds since the epoch"
+    try:
+        return float(text)
+    except ValueError:
+        from datetime import datetime
+        try:
+            return datetime.fromisoformat(text).timestamp()
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid time: {text!r}")
 
 def parse_command_args() -> object:
     "Set up argparse here. Call this function inside main."
@@ -14,8 +30,52 @@ def parse_command_args() -> object:
     # Add an optional flag for displaying memory usage in a human-readable format
     parser.add_argument("-H", "--human-readable", action="store_true", help="Display memory usage in human-readable format.")
 
-    parser.add_argument("program", type=str, nargs='?', help="If a program is specified, show memory use of all associated processes. Show only total use if not.")
+    # Add an optional flag for refreshing the report in place instead of printing it once
+    parser.add_argument("-w", "--watch", type=float, metavar="INTERVAL", help="Redraw the report every INTERVAL seconds until interrupted.")
+
+    # Add options for choosing how the program argument is matched against running processes
+    parser.add_argument("-m", "--match", choices=['name', 'comm', 'cmdline', 'exe'], default='name', help="Match the program against the process name like pidof (default), its comm, its full command line, or its executable path.")
+    parser.add_argument("-r", "--regex", action="store_true", help="Treat the program as a regular expression to search for instead of an exact name.")
+
+    # Add options for keeping a fixed-size history of samples in watch mode
+    parser.add_argument("--history", type=int, metavar="SAMPLES", help="Keep the last SAMPLES samples of system and program memory in watch mode. Defaults to the longest --window.")
+    parser.add_argument("--window", type=float, action="append", metavar="SECONDS", help="Report min, max, average and 95th percentile over the last SECONDS in watch mode. May be repeated.")
+    parser.add_argument("--show", choices=['current', 'min', 'max', 'avg', 'p95'], default='current', help="Value drawn in the system and program bar graphs: the current sample (default) or a statistic over the first --window, which is then required.")
+
+    # Add options for keeping samples on disk and looking back at them later
+    parser.add_argument("--record", metavar="FILE", help="Append every sample's memory totals and per-program Rss and Pss to the binary history FILE.")
+    parser.add_argument("--replay", metavar="FILE", help="Draw the samples stored in the history FILE instead of reading /proc.")
+    parser.add_argument("--from", dest="time_from", type=parse_time, metavar="T1", help="With --replay, start at this time (seconds since the epoch or YYYY-MM-DDTHH:MM:SS).")
+    parser.add_argument("--to", dest="time_to", type=parse_time, metavar="T2", help="With --replay, stop at this time (seconds since the epoch or YYYY-MM-DDTHH:MM:SS).")
+
+    # Add an optional grouping that reports shared-page aware Pss and Private memory per group
+    parser.add_argument("-g", "--group", choices=['program', 'parent'], help="Sum processes per program or per parent process and report Pss and Private memory alongside Rss. Groups every process on the system if no program is specified.")
+
+    # Add an optional machine-readable output format that skips the bar graphs
+    parser.add_argument("-f", "--format", choices=['text', 'jsonl', 'csv'], default='text', help="Write bar graphs (default), or one flushed JSON Lines or CSV record per sample, PID and program with values in kB.")
+
+    # Add an optional worker count for reading the smaps files of many processes at once
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N", help="Read the memory of up to N processes in parallel. Default is 1.")
+
+    # Add an optional file listing more programs to report on, one per line
+    parser.add_argument("-F", "--programs-file", type=argparse.FileType('r'), metavar="FILE", help="Also report on every program listed in FILE, one per line. Blank lines and lines starting with '#' are ignored.")
+
+    parser.add_argument("program", type=str, nargs='*', help="If programs are specified, show memory use of all associated processes of each. Show only total use if not.")
     args = parser.parse_args()
+
+    if args.programs_file:
+        with args.programs_file as f:
+            args.program += [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+    if (args.history or args.window or args.show != 'current') and not args.watch:
+        parser.error("--history, --window and --show need --watch")
+    if args.history and args.window and args.watch:
+        needed = max(window_samples(seconds, args.watch) for seconds in args.window)
+        if args.history < needed:
+            parser.error(f"--history {args.history} is too short for the longest --window, which needs {needed} samples")
+    if args.show != 'current' and not args.window:
+        parser.error("--show needs a --window to take the statistic over")
+    if (args.time_from is not None or args.time_to is not None) and not args.replay:
+        parser.error("--from and --to need --replay")
     return args
 
 def percent_to_graph(percent: float, length: int=20) -> str:
@@ -30,86 +90,269 @@ def percent_to_graph(percent: float, length: int=20) -> str:
     # Construct the bar graph string with '#' for the filled part and spaces for the unfilled part
     return f"{'#' * num_hashes}{' ' * num_spaces}"
 
-def get_sys_mem() -> int:
+class ProcFiles:
+    "Keep /proc files open between samples so they can be re-read without reopening"
+    """
+    At most limit handles are kept, the least recently read closed first. The default leaves
+    half of the soft RLIMIT_NOFILE for everything else; running out of descriptors anyway
+    lowers the limit and falls back to a plain open/read/close.
+    """
+
+    def __init__(self, limit: int=None):
+        import resource
+        import threading
+        if limit is None:
+            soft = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+            limit = 4096 if soft == resource.RLIM_INFINITY else soft // 2
+        self.limit = limit
+        self.handles = {}  # path -> open file object, least recently read first
+        self.used = set()  # paths read since the last sweep()
+        # Worker threads read different PIDs' files at the same time
+        self.lock = threading.Lock()
+
+    def read(self, path: str) -> bytes:
+        "Return the whole file, rewinding a handle that is already open"
+        with self.lock:
+            # Take the handle out while it is read, so no other thread can close it meanwhile
+            f = self.handles.pop(path, None)
+            self.used.add(path)
+        if f is None:
+            try:
+                f = open(path, 'rb')
+            except OSError as err:
+                import errno
+                if err.errno != errno.EMFILE:
+                    raise
+                # Out of descriptors: keep fewer handles from now on, and read this file without keeping it
+                self.shrink(len(self.handles) // 2)
+                with open(path, 'rb') as f:
+                    return f.read()
+        try:
+            # /proc files are regenerated on every read from offset 0
+            f.seek(0)
+            data = f.read()
+        except OSError:
+            # The process went away while the handle was open
+            f.close()
+            raise FileNotFoundError(path)
+        with self.lock:
+            previous = self.handles.pop(path, None)
+            self.handles[path] = f
+            evicted = self.evict()
+        for handle in filter(None, [previous] + evicted):
+            handle.close()
+        return data
+
+    def evict(self) -> list:
+        "Remove the least recently read handles over the limit and return them; call with the lock held"
+        evicted = []
+        while len(self.handles) > self.limit:
+            evicted.append(self.handles.pop(next(iter(self.handles))))
+        return evicted
+
+    def shrink(self, limit: int) -> None:
+        "Lower the limit and close the handles over it"
+        with self.lock:
+            self.limit = limit
+            evicted = self.evict()
+        for f in evicted:
+            f.close()
+
+    def sweep(self) -> None:
+        "Close the handles that were not read since the previous sweep"
+        with self.lock:
+            unused = [self.handles.pop(path) for path in list(self.handles) if path not in self.used]
+            self.used.clear()
+        for f in unused:
+            f.close()
+
+    def close(self) -> None:
+        "Close every handle"
+        with self.lock:
+            for f in self.handles.values():
+                f.close()
+            self.handles.clear()
+            self.used.clear()
+
+def read_proc_file(path: str, files: ProcFiles=None) -> bytes:
+    "Return the raw contents of a /proc file, using the persistent handles in files if given"
+    if files is not None:
+        return files.read(path)
+    with open(path, 'rb') as f:
+        return f.read()
+
+class MemInfo:
+    "One snapshot of /proc/meminfo, taken with a single read so every field is from the same moment"
+
+    __slots__ = ('values',)
+
+    # Field name -> index into values. The kernel always lists the same fields in the same
+    # order, so this is worked out from the first snapshot and shared by all later ones.
+    fields = {}
+
+    def __init__(self, files: ProcFiles=None, data: bytes=None):
+        if data is None:
+            data = read_proc_file('/proc/meminfo', files)
+        # Without the units every line is 'Name: value', so the tokens alternate name, value
+        tokens = data.replace(b' kB', b'').split()
+        # Every value in kB (or a plain count for the HugePages_* fields), in file order
+        self.values = array('q', map(int, tokens[1::2]))
+        if len(self.values) != len(MemInfo.fields):
+            MemInfo.fields = {name[:-1].decode(): index for index, name in enumerate(tokens[0::2])}
+
+    def get(self, name: str, default: int=0) -> int:
+        "Return the value of an exact field name such as 'MemFree', or default if it is missing"
+        index = self.fields.get(name)
+        return default if index is None else self.values[index]
+
+    @property
+    def total(self) -> int:
+        "Total system memory in kB"
+        return self.get('MemTotal')
+
+    @property
+    def available(self) -> int:
+        "Available memory in kB, falling back to MemFree + SwapFree on kernels without MemAvailable"
+        return self.get('MemAvailable') or self.get('MemFree') + self.get('SwapFree')
+
+def get_sys_mem(files: ProcFiles=None, meminfo: MemInfo=None) -> int:
     "Return total system memory in kB"
     """
-    This function reads the '/proc/meminfo' file and looks for the line that starts with 'MemTotal:'.
-    The total memory is extracted and returned as an integer representing the number of kibibytes (kB).
+    This function reads the '/proc/meminfo' file, unless a MemInfo snapshot is passed in,
+    and returns its 'MemTotal:' field as an integer number of kibibytes (kB), or 0 if it is missing.
     """
-    # Open the /proc/meminfo file in read mode
-    with open('/proc/meminfo', 'r') as f:
-        # Iterate through each line in the file
-        for line in f:
-            # Check if the line contains 'MemTotal:'
-            if 'MemTotal:' in line:
-                # Split the line into components and return the second component (the number) as an integer
-                return int(line.split()[1])
-    # If 'MemTotal:' is not found, return 0 as a fallback
-    return 0
-
-def get_avail_mem() -> int:
+    if meminfo is None:
+        meminfo = MemInfo(files)
+    return meminfo.total
+
+def get_avail_mem(files: ProcFiles=None, meminfo: MemInfo=None) -> int:
     "Return available memory in kB"
     """
-    This function reads the '/proc/meminfo' file and extracts the available memory based on the 'MemAvailable:',
-    'MemFree:', and 'SwapFree:' fields. It prioritizes 'MemAvailable:' but falls back to 'MemFree:' + 'SwapFree:'
-    if 'MemAvailable:' is not present.
+    This function reads the '/proc/meminfo' file, unless a MemInfo snapshot is passed in, and
+    extracts the available memory based on the 'MemAvailable:', 'MemFree:', and 'SwapFree:' fields.
+    It prioritizes 'MemAvailable:' but falls back to 'MemFree:' + 'SwapFree:' if 'MemAvailable:' is not present.
     """
-    # Initialize memory variables to 0
-    mem_free = 0
-    mem_available = 0
-    swap_free = 0
-
-    # Open the /proc/meminfo file in read mode
-    with open('/proc/meminfo', 'r') as f:
-        # Iterate through each line in the file
-        for line in f:
-            # Check if the line contains 'MemAvailable:'
-            if 'MemAvailable:' in line:
-                # Extract the value as an integer
-                mem_available = int(line.split()[1])
-            # Check if the line contains 'MemFree:'
-            elif 'MemFree:' in line:
-                # Extract the value as an integer
-                mem_free = int(line.split()[1])
-            # Check if the line contains 'SwapFree:'
-            elif 'SwapFree:' in line:
-                # Extract the value as an integer
-                swap_free = int(line.split()[1])
-
-        # If 'MemAvailable:' was found, return its value
-        if mem_available:
-            return mem_available
-        # Otherwise, return the sum of 'MemFree:' and 'SwapFree:'
-        return mem_free + swap_free
-
-def pids_of_prog(app_name: str) -> list:
+    if meminfo is None:
+        meminfo = MemInfo(files)
+    return meminfo.available
+
+# Details read from /proc/<pid>/{comm,cmdline,exe,stat}, keyed by PID and then by field.
+# Fields are read the first time a lookup needs them and kept until the process exits or
+# exec()s another program, which scan_proc() notices by reading comm again. The ppid is
+# only kept until the next scan, since a process is reparented when its parent exits.
+proc_info = {}
+# The PID set seen by the last scan, and the lookups already answered for it
+proc_scan_pids = None
+pid_matches = {}
+
+def scan_proc() -> frozenset:
+    "Return the PIDs currently in /proc, dropping cached details of processes that have exited or exec()ed"
+    global proc_scan_pids
+    pids = frozenset(entry.name for entry in os.scandir('/proc') if entry.name.isdigit())
+    # Something started or exited, so earlier lookups may be out of date
+    changed = pids != proc_scan_pids
+    for pid in list(proc_info):
+        if pid not in pids:
+            del proc_info[pid]
+            continue
+        proc_info[pid].pop('ppid', None)
+        # comm is one small read; when it changes the process exec()ed and its cmdline and exe did too
+        comm = read_proc_field(pid, 'comm')
+        if proc_info[pid].get('comm', comm) != comm:
+            proc_info[pid] = {}
+            changed = True
+        proc_info[pid]['comm'] = comm
+    if changed:
+        proc_scan_pids = pids
+        pid_matches.clear()
+    return pids
+
+def read_proc_field(proc_id: str, field: str) -> str:
+    "Read the comm, cmdline (arguments joined by spaces), exe or ppid of a process, or '' if unreadable"
+    try:
+        if field == 'exe':
+            return os.readlink(f'/proc/{proc_id}/exe')
+        if field == 'ppid':
+            # The fields after the parenthesised comm are: state, ppid, ...
+            return read_proc_file(f'/proc/{proc_id}/stat').rsplit(b')', 1)[1].split()[1].decode()
+        return read_proc_file(f'/proc/{proc_id}/{field}').rstrip(b'\n\0').replace(b'\0', b' ').decode(errors='replace')
+    except OSError:
+        # The process exited, or belongs to another user and hides its exe link
+        return ''
+
+def proc_field(proc_id: str, field: str) -> str:
+    "Return the comm, cmdline (arguments joined by spaces), exe or ppid of a process, or '' if unreadable"
+    info = proc_info.setdefault(proc_id, {})
+    if field not in info:
+        info[field] = read_proc_field(proc_id, field)
+    return info[field]
+
+def proc_names(proc_id: str, match: str) -> list:
+    "Return the strings of a process that a program name is compared with"
+    if match == 'comm':
+        return [proc_field(proc_id, 'comm')]
+    if match == 'cmdline':
+        return [proc_field(proc_id, 'cmdline')]
+    exe = proc_field(proc_id, 'exe')
+    if match == 'exe':
+        return [exe, os.path.basename(exe)]
+    # Like pidof: the comm, the base name of argv[0], or the base name of the executable
+    argv0 = proc_field(proc_id, 'cmdline').split(' ', 1)[0]
+    return [proc_field(proc_id, 'comm'), os.path.basename(argv0), os.path.basename(exe)]
+
+def pids_of_prog(app_name: str, match: str='name', regex: bool=False, rescan: bool=True) -> list:
     "Given an app name, return all PIDs associated with app"
-    # Execute the 'pidof' command to find the PIDs associated with the app name
-    pids = os.popen(f'pidof {app_name}').read().strip()
-    
-    # If PIDs are found, split them into a list; if not, return an empty list
-    return pids.split() if pids else []
+    # Walk /proc in-process instead of forking a shell and pidof; rescan=False reuses the last PID set
+    pids = scan_proc() if rescan or proc_scan_pids is None else proc_scan_pids
+    lookup = (app_name, match, regex)
+    if lookup not in pid_matches:
+        is_match = re.compile(app_name).search if regex else app_name.__eq__
+        found = [pid for pid in pids if any(name and is_match(name) for name in proc_names(pid, match))]
+        # Highest PID first, the same order pidof prints
+        pid_matches[lookup] = sorted(found, key=int, reverse=True)
+    return list(pid_matches[lookup])
 
-def rss_mem_of_pid(proc_id: str) -> int:
-    "Given a process ID, return the Resident memory used"
+# Memory totals of one process, all in kB
+SmapsTotals = namedtuple('SmapsTotals', ['rss', 'pss', 'shared', 'private'])
+
+# smaps_rollup (Linux 4.14+) has the kernel sum every mapping for us
+HAVE_SMAPS_ROLLUP = os.path.exists('/proc/self/smaps_rollup')
+
+# One pattern per SmapsTotals field. Anchoring on the preceding newline keeps 'Pss:' from also
+# matching 'SwapPss:' while still giving the regex engine a literal prefix to search for quickly.
+SMAPS_FIELDS = {
+    'rss': re.compile(rb'\nRss:\s+(\d+)'),
+    'pss': re.compile(rb'\nPss:\s+(\d+)'),
+    'shared': re.compile(rb'\nShared_(?:Clean|Dirty):\s+(\d+)'),
+    'private': re.compile(rb'\nPrivate_(?:Clean|Dirty):\s+(\d+)'),
+}
+
+def parse_smaps(data: bytes) -> SmapsTotals:
+    "Sum the memory fields of the raw contents of an smaps or smaps_rollup file"
+    # Each findall() scans the whole buffer in C, instead of splitting every line in Python
+    return SmapsTotals(**{name: sum(map(int, pattern.findall(data))) for name, pattern in SMAPS_FIELDS.items()})
+
+def mem_of_pid(proc_id: str, files: ProcFiles=None) -> SmapsTotals:
+    "Given a process ID, return its Rss, Pss, Shared and Private memory in kB"
+    smaps_file = 'smaps_rollup' if HAVE_SMAPS_ROLLUP else 'smaps'
     try:
-        # Open the smaps file for the given process ID
-        with open(f'/proc/{proc_id}/smaps', 'r') as f:
-            rss = 0  # Initialize the total RSS memory counter
-            
-            # Iterate through each line in the smaps file
-            for line in f:
-                # Check if the line contains 'Rss:'
-                if 'Rss:' in line:
-                    # Extract the value (in kB) and add it to the rss counter
-                    rss += int(line.split()[1])
-            
-            # Return the total RSS memory used by the process
-            return rss
-
-    except FileNotFoundError:
-        # If the process does not exist (e.g., the PID is invalid), return 0
-        return 0
+        # Read the whole file in binary mode with a single read
+        return parse_smaps(read_proc_file(f'/proc/{proc_id}/{smaps_file}', files))
+
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        # If the process does not exist (e.g., the PID is invalid) or belongs to another user, return 0
+        return SmapsTotals(0, 0, 0, 0)
+
+def rss_mem_of_pid(proc_id: str, files: ProcFiles=None) -> int:
+    "Given a process ID, return the Resident memory used"
+    return mem_of_pid(proc_id, files).rss
+
+def mem_of_pids(pids: list, files: ProcFiles=None, pool: 'ThreadPoolExecutor'=None) -> list:
+    "Return mem_of_pid() for every PID, in the same order, using the thread pool if one is given"
+    if pool is None:
+        return [mem_of_pid(pid, files) for pid in pids]
+    # Reading /proc is kernel work that releases the GIL; map() keeps the results in PID order
+    return list(pool.map(lambda pid: mem_of_pid(pid, files), pids))
 
 def bytes_to_human_r(kibibytes: int, decimal_places: int=2) -> str:
     "Turn 1,024 into 1 MiB, for example"
@@ -123,17 +366,191 @@ def bytes_to_human_r(kibibytes: int, decimal_places: int=2) -> str:
     str_result += suffixes[suf_count]
     return str_result
 
-if __name__ == "__main__":
-    # Parse command-line arguments
-    args = parse_command_args()
+class RingBuffer:
+    "The last size samples of one series in an array('q'), overwriting the oldest once full"
+
+    __slots__ = ('values', 'next', 'count')
+
+    def __init__(self, size: int):
+        self.values = array('q', bytes(8 * size))
+        self.next = 0   # index the next sample is written to
+        self.count = 0  # samples held, up to size
+
+    def append(self, value: int) -> None:
+        self.values[self.next] = value
+        self.next = (self.next + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+
+    def last(self, samples: int) -> list:
+        "Return up to the most recent samples values, oldest first"
+        samples = min(samples, self.count)
+        start = (self.next - samples) % len(self.values)
+        if start + samples <= len(self.values):
+            return self.values[start:start + samples].tolist()
+        return (self.values[start:] + self.values[:self.next]).tolist()
+
+    def stats(self, samples: int) -> tuple:
+        "Return (min, max, average, 95th percentile) of the most recent samples values"
+        window = sorted(self.last(samples))
+        if not window:
+            return 0, 0, 0, 0
+        # Nearest-rank percentile: the smallest value with at least 95% of the window at or below it
+        p95 = window[max(0, -(-len(window) * 95 // 100) - 1)]
+        return window[0], window[-1], sum(window) // len(window), p95
+
+def window_samples(seconds: float, interval: float) -> int:
+    "Number of samples taken every interval seconds that cover a window of seconds"
+    return max(1, -int(-seconds // interval))
+
+class History:
+    "Ring buffers of recent system and program memory samples, with statistics over time windows"
+
+    STATS = ('min', 'max', 'avg', 'p95')
+
+    def __init__(self, interval: float, windows: list, size: int=None):
+        # Each window as (label, number of samples it covers at this interval)
+        self.windows = [(f"{seconds:g}s", window_samples(seconds, interval)) for seconds in windows or []]
+        self.size = size or max([samples for _, samples in self.windows], default=1)
+        self.series = {}  # name -> RingBuffer; one per program, so memory use stays fixed
+
+    def record(self, name: str, value: int) -> None:
+        if name not in self.series:
+            self.series[name] = RingBuffer(self.size)
+        self.series[name].append(value)
+
+    def shown(self, name: str, show: str) -> int:
+        "Return the latest sample, or the chosen statistic over the first window (or the whole history)"
+        buffer = self.series[name]
+        if show == 'current':
+            return buffer.last(1)[-1]
+        samples = self.windows[0][1] if self.windows else self.size
+        return buffer.stats(samples)[self.STATS.index(show)]
 
-    # Get total and available system memory
-    total_mem = get_sys_mem()
-    avail_mem = get_avail_mem()
+    def window_stats(self, name: str) -> list:
+        "Return [(label, (min, max, avg, p95))] for every window of a series"
+        buffer = self.series[name]
+        return [(label, buffer.stats(samples)) for label, samples in self.windows]
+
+    def stats_lines(self, name: str, human_readable: bool) -> list:
+        "Build one indented report line per window of a series"
+        human = bytes_to_human_r if human_readable else str
+        return [f"{'':<10} {label:>6}  " + "  ".join(f"{stat} {human(value)}" for stat, value in zip(self.STATS, values))
+                for label, values in self.window_stats(name)]
+
+def group_rows(rows: list, by: str) -> list:
+    "Group (pid, SmapsTotals) rows by program name or parent PID, largest total Pss first"
+    groups = {}
+    for pid, mem in rows:
+        if by == 'parent':
+            ppid = proc_field(pid, 'ppid')
+            parent = proc_field(ppid, 'comm')
+            label = f"{ppid} ({parent})" if parent else ppid
+        else:
+            label = proc_field(pid, 'comm')
+        groups.setdefault(label, []).append((pid, mem))
+    return sorted(groups.items(), key=lambda group: -sum(mem.pss for _, mem in group[1]))
+
+def take_sample(args: object, files: ProcFiles=None, pool: 'ThreadPoolExecutor'=None) -> tuple:
+    "Return a MemInfo snapshot, each program's [(pid, SmapsTotals)] rows, and the args.group groups of rows"
+    # Get total and available system memory from a single read of /proc/meminfo
+    meminfo = MemInfo(files)
+    programs = []
+    groups = []
+    if args.program:
+        # Scan /proc once and match every program against that same PID set
+        scan_proc()
+        for program in args.program:
+            # Get PIDs associated with the specified program
+            pids = pids_of_prog(program, args.match, args.regex, rescan=False)
+            programs.append((program, list(zip(pids, mem_of_pids(pids, files, pool)))))
+        if args.group == 'program':
+            groups = programs
+        elif args.group == 'parent':
+            # The same PID can match more than one program; count it once
+            rows = dict(row for _, program_rows in programs for row in program_rows)
+            groups = group_rows(rows.items(), 'parent')
+    elif args.group:
+        # One smaps read per process gives Rss, Pss and Private together
+        pids = sorted(scan_proc(), key=int)
+        rows = [(pid, mem) for pid, mem in zip(pids, mem_of_pids(pids, files, pool)) if mem.rss]
+        groups = group_rows(rows, args.group)
+    return meminfo, programs, groups
+
+def program_report(program: str, rows: list, total_mem: int, args: object, shown: int=None) -> list:
+    "Build the per-PID and total report lines for one program from its (pid, SmapsTotals) rows"
+    """
+    If shown is given, the total line draws that value (e.g. a windowed statistic) instead of the current sum.
+    """
+    lines = []
+
+    if not rows:
+        # Add a message if no PIDs are found for the specified program
+        lines.append(f"{program} not found.")
+    else:
+        total_program_mem = 0
+
+        # Iterate through each PID and its memory usage
+        for pid, mem in rows:
+            rss = mem.rss
+            total_program_mem += rss
+            percent = rss / total_mem
+
+            # Convert RSS memory value to human-readable format if required
+            human_rss = bytes_to_human_r(rss) if args.human_readable else f"{rss}"
+            human_total_mem = bytes_to_human_r(total_mem) if args.human_readable else f"{total_mem}"
+
+            # Generate the bar graph for each PID's memory usage
+            graph = percent_to_graph(percent, args.length)
+            # Add the memory usage for each PID
+            lines.append(f"{pid:<10} [{graph}| {int(percent * 100)}%] {human_rss}/{human_total_mem}")
+
+        if shown is not None:
+            total_program_mem = shown
+
+        # Convert total program memory value to human-readable format if required
+        if args.human_readable:
+            human_total_program_mem = bytes_to_human_r(total_program_mem)
+        else:
+            human_total_program_mem = f"{total_program_mem}"
+        # Add the total memory usage for the program
+        lines.append(f"{program:<10} [{percent_to_graph(total_program_mem / total_mem, args.length)}| {int((total_program_mem / total_mem) * 100)}%] {human_total_program_mem}/{total_mem}")
+
+    return lines
+
+def group_report(label: str, rows: list, total_mem: int, args: object) -> str:
+    "Build the report line for one group, with the bar graph showing its Pss"
+    rss = sum(mem.rss for _, mem in rows)
+    pss = sum(mem.pss for _, mem in rows)
+    private = sum(mem.private for _, mem in rows)
+    percent = pss / total_mem
+
+    # Convert memory values to human-readable format if required
+    human = bytes_to_human_r if args.human_readable else str
+    graph = percent_to_graph(percent, args.length)
+    return f"{label:<10} [{graph}| {int(percent * 100)}%] {human(pss)}/{human(total_mem)} (Rss {human(rss)}, Private {human(private)}, {len(rows)} processes)"
+
+def record_history(history: History, meminfo: MemInfo, programs: list) -> None:
+    "Add the used system memory and each program's total Rss to the history"
+    history.record('Memory', meminfo.total - meminfo.available)
+    for program, rows in programs:
+        history.record(program, sum(mem.rss for _, mem in rows))
+
+def memory_report(args: object, sample: tuple, history: History=None) -> list:
+    "Build the report lines for the system, for every process of each program in args.program, or for each group"
+    meminfo, programs, groups = sample
+    total_mem = get_sys_mem(meminfo=meminfo)
+    avail_mem = get_avail_mem(meminfo=meminfo)
     used_mem = total_mem - avail_mem
+    if history is not None:
+        used_mem = history.shown('Memory', args.show)
     used_percent = used_mem / total_mem
+    lines = []
 
-    if not args.program:  # No program name specified.
+    if args.group:  # Grouped Pss report.
+        for label, rows in groups:
+            lines.append(group_report(label, rows, total_mem, args) if rows else f"{label} not found.")
+
+    elif not args.program:  # No program name specified.
         # Convert memory values to human-readable format if required
         human_total = bytes_to_human_r(total_mem) if args.human_readable else f"{total_mem}"
         human_used = bytes_to_human_r(used_mem) if args.human_readable else f"{used_mem}"
@@ -142,39 +559,260 @@ if __name__ == "__main__":
         # Generate the bar graph for memory usage
         graph = percent_to_graph(used_percent, args.length)
 
-        # Print the memory usage summary for the entire system
-        print(f"Memory         [{graph}| {percent}%] {human_used}/{human_total}")
+        # Add the memory usage summary for the entire system
+        lines.append(f"Memory         [{graph}| {percent}%] {human_used}/{human_total}")
+        if history is not None:
+            lines += history.stats_lines('Memory', args.human_readable)
+
+    else:  # Program names specified.
+        for program, rows in programs:
+            if history is None:
+                lines += program_report(program, rows, total_mem, args)
+            else:
+                lines += program_report(program, rows, total_mem, args, history.shown(program, args.show))
+                lines += history.stats_lines(program, args.human_readable)
+
+    return lines
+
+# Columns of the jsonl/csv records; fields that do not apply to a record type are left empty
+RECORD_FIELDS = ['time', 'type', 'program', 'group', 'pid', 'processes', 'rss', 'pss', 'shared', 'private', 'used', 'available', 'total',
+                 'series', 'window', 'min', 'max', 'avg', 'p95']
+
+def sum_rows(rows: list) -> dict:
+    "Return the rss, pss, shared and private totals of (pid, SmapsTotals) rows"
+    return {field: sum(getattr(mem, field) for _, mem in rows) for field in SmapsTotals._fields}
+
+def sample_records(meminfo: MemInfo, programs: list, groups: list, when: float) -> list:
+    "Turn one sample into a system record followed by pid, program and group records, all in kB"
+    total_mem = meminfo.total
+    records = [{'time': when, 'type': 'system', 'used': total_mem - meminfo.available,
+                'available': meminfo.available, 'total': total_mem}]
+    for program, rows in programs:
+        for pid, mem in rows:
+            records.append({'time': when, 'type': 'pid', 'program': program, 'pid': int(pid),
+                            **mem._asdict(), 'total': total_mem})
+        records.append({'time': when, 'type': 'program', 'program': program, 'processes': len(rows),
+                        **sum_rows(rows), 'total': total_mem})
+    # Grouping by program adds nothing to the program records above
+    if groups is not programs:
+        for label, rows in groups:
+            records.append({'time': when, 'type': 'group', 'group': label, 'processes': len(rows),
+                            **sum_rows(rows), 'total': total_mem})
+    return records
+
+def history_records(history: History, when: float) -> list:
+    "Turn the windowed statistics of every series into window records, all in kB"
+    return [{'time': when, 'type': 'window', 'series': name, 'window': label, **dict(zip(History.STATS, values))}
+            for name in history.series for label, values in history.window_stats(name)]
+
+class TextDisplay:
+    "Print the bar-graph report, redrawing the previous one in place if asked to"
+
+    def __init__(self, redraw: bool=False, history: History=None):
+        self.redraw = redraw
+        self.history = history
+        self.drawn = 0  # lines printed by the previous call
+
+    def __call__(self, args: object, sample: tuple, when: float) -> None:
+        self.show(memory_report(args, sample, self.history))
 
-    else:  # Program name specified.
+    def show(self, lines: list) -> None:
+        if self.redraw and self.drawn:
+            # Move to the start of the previous report and clear it
+            sys.stdout.write(f"\033[{self.drawn}F\033[J")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        self.drawn = len(lines)
 
-        # Get PIDs associated with the specified program
-        pids = pids_of_prog(args.program)
-        if not pids:
-            # Print a message if no PIDs are found for the specified program
-            print(f"{args.program} not found.")
+class RecordDisplay:
+    "Write every sample as JSON Lines or CSV records, flushing each one so a pipe can consume it at once"
+
+    def __init__(self, output_format: str, stream: object=sys.stdout, history: History=None):
+        self.stream = stream
+        self.history = history
+        # Only the record formats need these, so plain reports start without them
+        import csv
+        import json
+        if output_format == 'csv':
+            writer = csv.DictWriter(stream, fieldnames=RECORD_FIELDS, restval='', lineterminator='\n')
+            writer.writeheader()
+            self.write = writer.writerow
         else:
-            total_program_mem = 0
-
-            # Iterate through each PID and calculate memory usage
-            for pid in pids:
-                rss = rss_mem_of_pid(pid)
-                total_program_mem += rss
-                percent = rss / total_mem
-
-                # Convert RSS memory value to human-readable format if required
-                human_rss = bytes_to_human_r(rss) if args.human_readable else f"{rss}"
-                human_total_mem = bytes_to_human_r(total_mem) if args.human_readable else f"{total_mem}"
-
-                # Generate the bar graph for each PID's memory usage
-                graph = percent_to_graph(percent, args.length)
-                # Print the memory usage for each PID
-                print(f"{pid:<10} [{graph}| {int(percent * 100)}%] {human_rss}/{human_total_mem}")
-
-            # Convert total program memory value to human-readable format if required
-            if args.human_readable:
-                human_total_program_mem = bytes_to_human_r(total_program_mem)
-            else:
-                human_total_program_mem = f"{total_program_mem}"
-            # Print the total memory usage for the program
-            print(f"{args.program:<10} [{percent_to_graph(total_program_mem / total_mem, args.length)}| {int((total_program_mem / total_mem) * 100)}%] {human_total_program_mem}/{total_mem}")
+            self.write = lambda record: stream.write(json.dumps(record) + '\n')
+
+    def __call__(self, args: object, sample: tuple, when: float) -> None:
+        when = round(when, 3)
+        records = sample_records(*sample, when)
+        if self.history is not None:
+            records += history_records(self.history, when)
+        for record in records:
+            self.write(record)
+            self.stream.flush()
+
+class HistoryFile:
+    "An append-only file of fixed-width sample records that is read in place through mmap"
+    """
+    Layout: a header of magic, record width and program count (HEADER), then one NAME_SIZE byte
+    NUL-padded name per tracked program, then records. Each record is width native-endian int64s:
+    time in milliseconds since the epoch, MemTotal, MemAvailable, then Rss and Pss of every program,
+    all in kB. Every part is a multiple of 8 bytes, so the records can be viewed as one int64 array.
+    """
+
+    MAGIC = b'MEMHIST1'
+    HEADER = '<8sII'
+    NAME_SIZE = 64
+
+    def __init__(self, path: str, programs: list=None):
+        "Open path for reading, or for appending samples of programs if they are given"
+        import mmap
+        import struct
+        header = struct.Struct(self.HEADER)
+        self.path = path
+        self.file = open(path, 'rb' if programs is None else 'ab+')
+        self.map = None
+        try:
+            names = [program.encode()[:self.NAME_SIZE] for program in programs or []]
+            if programs is not None and os.fstat(self.file.fileno()).st_size == 0:
+                self.file.write(header.pack(self.MAGIC, 3 + 2 * len(names), len(names)))
+                self.file.write(b''.join(name.ljust(self.NAME_SIZE, b'\0') for name in names))
+                self.file.flush()
+            if os.fstat(self.file.fileno()).st_size < header.size:
+                raise ValueError(f"{path} is not a memory history file")
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.width, count = header.unpack_from(self.map)
+            self.header_size = header.size + count * self.NAME_SIZE
+            if magic != self.MAGIC or self.width != 3 + 2 * count or len(self.map) < self.header_size:
+                raise ValueError(f"{path} is not a memory history file")
+            stored = [self.map[offset:offset + self.NAME_SIZE].rstrip(b'\0')
+                      for offset in range(header.size, self.header_size, self.NAME_SIZE)]
+            self.programs = [name.decode(errors='replace') for name in stored]
+            if programs is not None and stored != names:
+                raise ValueError(f"{path} records {self.programs}, not {programs}")
+        except:
+            self.close()
+            raise
+
+    def append(self, when: float, meminfo: MemInfo, programs: list) -> None:
+        "Write one record for a sample; a single write keeps concurrent readers from seeing half of it"
+        values = array('q', [int(when * 1000), meminfo.total, meminfo.available])
+        for _, rows in programs:
+            values.extend((sum(mem.rss for _, mem in rows), sum(mem.pss for _, mem in rows)))
+        self.file.write(values.tobytes())
+        self.file.flush()
+
+    def records(self, start: float=None, end: float=None) -> list:
+        "Return zero-copy int64 views of the records between two times in seconds, oldest first"
+        import mmap
+        from bisect import bisect_left, bisect_right
+        # Map the file again to see records appended since it was opened
+        self.map.close()
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        # Ignore a partly written record at the end
+        count = (len(self.map) - self.header_size) // (8 * self.width)
+        data = memoryview(self.map)[self.header_size:self.header_size + count * 8 * self.width].cast('q')
+        times = data[::self.width]
+        first = 0 if start is None else bisect_left(times, start * 1000)
+        last = count if end is None else bisect_right(times, end * 1000)
+        return [data[index * self.width:(index + 1) * self.width] for index in range(first, last)]
+
+    def close(self) -> None:
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+def replay_report(args: object, record: memoryview, programs: list) -> list:
+    "Build the report lines for one history record: the system line, then one total line per program"
+    total_mem, avail_mem = record[1], record[2]
+    used_mem = total_mem - avail_mem
+    human = bytes_to_human_r if args.human_readable else str
+    from datetime import datetime
+    lines = [datetime.fromtimestamp(record[0] / 1000).isoformat(sep=' ', timespec='seconds'),
+             f"Memory         [{percent_to_graph(used_mem / total_mem, args.length)}| {int(used_mem / total_mem * 100)}%] {human(used_mem)}/{human(total_mem)}"]
+    for index, program in enumerate(programs):
+        rss = record[3 + 2 * index]
+        lines.append(f"{program:<10} [{percent_to_graph(rss / total_mem, args.length)}| {int((rss / total_mem) * 100)}%] {human(rss)}/{total_mem}")
+    return lines
+
+def replay_history(args: object) -> None:
+    "Print the report for every record of args.replay between args.time_from and args.time_to"
+    history_file = HistoryFile(args.replay)
+    try:
+        records = history_file.records(args.time_from, args.time_to)
+        try:
+            for record in records:
+                print("\n".join(replay_report(args, record, history_file.programs)))
+        finally:
+            # The map cannot be closed while views of it are still alive
+            for record in records:
+                record.release()
+    finally:
+        history_file.close()
+
+def report_once(args: object, display: object, files: ProcFiles=None, pool: 'ThreadPoolExecutor'=None,
+                history: History=None, history_file: HistoryFile=None) -> None:
+    "Take one sample, add it to the history and the history file if there are any, and display it"
+    sample = take_sample(args, files, pool)
+    when = time.time()
+    if history is not None:
+        record_history(history, sample[0], sample[1])
+    if history_file is not None:
+        history_file.append(when, sample[0], sample[1])
+    display(args, sample, when)
+
+def watch_report(args: object, display: object, pool: 'ThreadPoolExecutor'=None,
+                 history: History=None, history_file: HistoryFile=None) -> None:
+    "Report every args.watch seconds, keeping the /proc files open between samples"
+    files = ProcFiles()
+    try:
+        while True:
+            report_once(args, display, files, pool, history, history_file)
+            # Close the smaps handles of processes that are no longer reported
+            files.sweep()
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        files.close()
+
+if __name__ == "__main__":
+    # Parse command-line arguments
+    args = parse_command_args()
+
+    if args.replay:
+        # Draw stored samples instead of reading /proc
+        try:
+            replay_history(args)
+        except (OSError, ValueError) as err:
+            sys.exit(f"{sys.argv[0]}: {err}")
+        sys.exit()
+
+    # Only start worker threads (and import the machinery for them) when more than one job was asked for
+    pool = None
+    if args.jobs > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        pool = ThreadPoolExecutor(max_workers=args.jobs)
+
+    # Keep a fixed-size sample history only when one was asked for
+    history = History(args.watch, args.window, args.history) if args.history or args.window else None
+
+    # Append samples to a history file only when one was given
+    try:
+        history_file = HistoryFile(args.record, args.program) if args.record else None
+    except (OSError, ValueError) as err:
+        sys.exit(f"{sys.argv[0]}: {err}")
+
+    if args.format == 'text':
+        # Only move the cursor back when a terminal is attached; pipes get one report after another
+        display = TextDisplay(redraw=bool(args.watch) and sys.stdout.isatty(), history=history)
+    else:
+        display = RecordDisplay(args.format, history=history)
+
+    if args.watch:
+        watch_report(args, display, pool, history, history_file)
+    else:
+        report_once(args, display, pool=pool, history_file=history_file)
 
+    if history_file is not None:
+        history_file.close()
+    if pool is not None:
+        pool.shutdown()
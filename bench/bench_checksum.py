@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+#Author: Jemark Amon
+#Author ID: jamon@myseneca.ca
+
+"""
+Micro-benchmark for the update checksums in labcheck.py.
+
+Writes text files of a few megabytes and times the original
+ChecksumLocal/ChecksumLatest, which joined the lines with repeated string
+concatenation and re-encoded the result before hashing, against the
+chunked sha256_stream versions. ChecksumLatest is timed through a file://
+URL so no network is needed.
+
+Usage:
+./bench_checksum.py [-s MB [MB ...]] [-n REPEAT]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import timeit
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import labcheck
+
+def old_checksum_latest(url=None):
+    "ChecksumLatest as it was before sha256_stream"
+    dat = ''
+    with urllib.request.urlopen(url) as response:
+        for line in response:
+            line = line.decode('utf-8')
+            dat = dat + line
+    return hashlib.sha256(dat.encode('utf-8')).digest()
+
+def old_checksum_local(filename=None):
+    "ChecksumLocal as it was before sha256_stream"
+    fil = open(filename, 'r', encoding='utf-8')
+    dat = fil.readlines()
+    textdata = ''
+    for line in dat:
+        textdata = textdata + line
+    return hashlib.sha256(textdata.encode('utf-8')).digest()
+
+def write_text(path: str, megabytes: int) -> None:
+    "Write about the given number of MiB of checker-like source lines"
+    line = "        self.assertEqual(stdout, expected_output, msg=error_output)  # {:08d}\n"
+    with open(path, 'w') as f:
+        for i in range(megabytes * 1048576 // len(line.format(0))):
+            f.write(line.format(i))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the old and new checker checksums")
+    parser.add_argument("-s", "--sizes", type=int, nargs='+', default=[1, 4, 16], metavar='MB', help="File sizes to hash in MiB. Default is 1 4 16.")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="Number of timed runs; the best one is reported. Default is 3.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for megabytes in args.sizes:
+            path = os.path.join(tmp, f'{megabytes}.py')
+            url = 'file://' + path
+            write_text(path, megabytes)
+            # Both versions must agree before their timings mean anything
+            assert old_checksum_local(path) == labcheck.ChecksumLocal(path) == old_checksum_latest(url) == labcheck.ChecksumLatest(url)
+
+            print(f"{megabytes} MiB:")
+            for label, old, new, target in (("ChecksumLocal", old_checksum_local, labcheck.ChecksumLocal, path),
+                                            ("ChecksumLatest (file://)", old_checksum_latest, labcheck.ChecksumLatest, url)):
+                old_time = min(timeit.repeat(lambda: old(target), number=1, repeat=args.repeat))
+                new_time = min(timeit.repeat(lambda: new(target), number=1, repeat=args.repeat))
+                print(f"  {label:<25} old {old_time * 1000:8.1f} ms   new {new_time * 1000:8.1f} ms  ({old_time / new_time:.1f}x)")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+#Author: Jemark Amon
+#Author ID: jamon@myseneca.ca
+
+"""
+Startup benchmark for the lab checkers.
+
+Imports each checker in a fresh interpreter under -X importtime, reports
+the best cumulative import time and the slowest modules it pulled in, and
+exits with status 1 if a checker goes over the time budget or loads one of
+the modules labcheck.py only imports when a feature needs it (the update
+check, subprocess runs, JUnit output, batch mode, ...).
+
+The budget is for the time spent on top of importing argparse and unittest,
+which every checker needs. That baseline is measured in the same run,
+alternating with the checker imports, so a slow or busy machine slows
+both alike.
+
+Usage:
+./bench_import.py [-c CHECKER [CHECKER ...]] [-n REPEAT] [-b MS] [-t TOP]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CHECKERS = ['lab1/CheckLab1.py', 'lab2/CheckLab2.py']
+# What labcheck.py has to import to run at all; timed on its own as the baseline
+BASELINE = ['argparse', 'unittest']
+# Must not be loaded just by importing a checker
+DEFERRED = ['urllib.request', 'http.client', 'ssl', 'email', 'socket', 'subprocess', 'hashlib',
+            'xml.etree', 'multiprocessing', 'concurrent.futures', 'pickle']
+
+def import_times(modules: list, directory: str=ROOT) -> dict:
+    "Import modules in a fresh interpreter and return {module: cumulative microseconds}"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([directory, ROOT]))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + ', '.join(modules)],
+                            cwd=directory, env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def checker_times(checker: str) -> tuple:
+    "Import a checker and return its total import time and {module: cumulative microseconds} for what it pulled in"
+    directory, filename = os.path.split(os.path.join(ROOT, checker))
+    module = os.path.splitext(filename)[0]
+    times = import_times([module], directory)
+    # The checker itself and the shared engine only wrap everything else
+    total = times.pop(module)
+    times.pop('labcheck', None)
+    return total, times
+
+def baseline_time() -> int:
+    "Microseconds to import just the BASELINE modules"
+    times = import_times(BASELINE)
+    return sum(times[module] for module in BASELINE)
+
+def deferred_loaded(times: dict) -> list:
+    return sorted(name for name in times if any(name == d or name.startswith(d + '.') for d in DEFERRED))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time how long the checkers take to import")
+    parser.add_argument("-c", "--checkers", nargs='+', default=CHECKERS, metavar='CHECKER', help="Checkers to import, relative to the repository root. Default is " + ' '.join(CHECKERS) + ".")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Number of imports per checker; the best one is reported. Default is 5.")
+    parser.add_argument("-b", "--budget", type=float, default=30.0, metavar='MS', help="Fail if a checker takes more than this longer to import than argparse and unittest alone. Default is 30 ms.")
+    parser.add_argument("-t", "--top", type=int, default=5, help="Number of slowest modules to list. Default is 5.")
+    args = parser.parse_args()
+
+    failed = False
+    for checker in args.checkers:
+        runs = []
+        baselines = []
+        for _ in range(args.repeat):
+            runs.append(checker_times(checker))
+            baselines.append(baseline_time())
+        total, best = min(runs, key=lambda run: run[0])
+        total /= 1000
+        baseline = min(baselines) / 1000
+        status = 'ok' if total - baseline <= args.budget else 'OVER BUDGET'
+        print(f"{checker}: {total:.1f} ms, {total - baseline:.1f} ms over the {' + '.join(BASELINE)} baseline of {baseline:.1f} ms (budget {args.budget:.0f} ms) {status}")
+        slowest = sorted(best.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for name, micros in slowest:
+            print(f"  {name:<30} {micros / 1000:8.1f} ms")
+        loaded = deferred_loaded(best)
+        if loaded:
+            print("  loaded at import time, should be deferred:", ', '.join(loaded))
+        failed = failed or total - baseline > args.budget or bool(loaded)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+#Author: Jemark Amon
+#Author ID: jamon@myseneca.ca
+
+"""
+Micro-benchmark for one memory sample in a2/assignment2.py.
+
+Times the original pair of get_sys_mem()/get_avail_mem() calls, which
+opened and scanned /proc/meminfo once each, against a single MemInfo
+snapshot, both freshly opened and through the persistent ProcFiles
+handle used by watch mode.
+
+Usage:
+./bench_meminfo.py [-n NUMBER]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'a2'))
+import assignment2
+
+def old_get_sys_mem() -> int:
+    "get_sys_mem as it was before MemInfo"
+    with open('/proc/meminfo', 'r') as f:
+        for line in f:
+            if 'MemTotal:' in line:
+                return int(line.split()[1])
+    return 0
+
+def old_get_avail_mem() -> int:
+    "get_avail_mem as it was before MemInfo"
+    mem_free = 0
+    mem_available = 0
+    swap_free = 0
+    with open('/proc/meminfo', 'r') as f:
+        for line in f:
+            if 'MemAvailable:' in line:
+                mem_available = int(line.split()[1])
+            elif 'MemFree:' in line:
+                mem_free = int(line.split()[1])
+            elif 'SwapFree:' in line:
+                swap_free = int(line.split()[1])
+        if mem_available:
+            return mem_available
+        return mem_free + swap_free
+
+def old_sample() -> tuple:
+    return old_get_sys_mem(), old_get_avail_mem()
+
+def new_sample(files: assignment2.ProcFiles=None) -> tuple:
+    meminfo = assignment2.MemInfo(files)
+    return meminfo.total, meminfo.available
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the per-sample cost of reading /proc/meminfo")
+    parser.add_argument("-n", "--number", type=int, default=20000, help="Samples per timed run. Default is 20000.")
+    args = parser.parse_args()
+
+    files = assignment2.ProcFiles()
+    # MemTotal always agrees; MemAvailable may move between the reads
+    assert old_sample()[0] == new_sample()[0] == new_sample(files)[0]
+
+    for label, sample in (("old: two opens + text scans", old_sample),
+                          ("new: MemInfo, fresh open", new_sample),
+                          ("new: MemInfo, kept-open handle", lambda: new_sample(files))):
+        best = min(timeit.repeat(sample, number=args.number, repeat=5))
+        print(f"{label:<32} {best / args.number * 1e6:8.2f} us/sample")
+    files.close()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+#Author: Jemark Amon
+#Author ID: jamon@myseneca.ca
+
+"""
+Micro-benchmark for the smaps parsing in a2/assignment2.py.
+
+Writes a synthetic smaps file with 50,000 mappings (about the size of a
+large JVM or browser process) and times the original line-by-line text
+scan against the binary single-read parser used by mem_of_pid().
+
+Usage:
+./bench_smaps.py [-m MAPPINGS] [-n REPEAT]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'a2'))
+import assignment2
+
+MAPPING = """{start:012x}-{end:012x} r-xp 00000000 fe:00 467394                     /usr/lib/libexample.so
+Size:                 {size} kB
+KernelPageSize:        4 kB
+MMUPageSize:           4 kB
+Rss:                  {size} kB
+Pss:                  {pss} kB
+Pss_Dirty:             0 kB
+Shared_Clean:         {shared} kB
+Shared_Dirty:          0 kB
+Private_Clean:        {private} kB
+Private_Dirty:         0 kB
+Referenced:           {size} kB
+Anonymous:             0 kB
+KSM:                   0 kB
+LazyFree:              0 kB
+AnonHugePages:         0 kB
+ShmemPmdMapped:        0 kB
+FilePmdMapped:         0 kB
+Shared_Hugetlb:        0 kB
+Private_Hugetlb:       0 kB
+Swap:                  0 kB
+SwapPss:               0 kB
+Locked:                0 kB
+THPeligible:           0
+ProtectionKey:         0
+VmFlags: rd ex mr mw me
+"""
+
+def write_synthetic_smaps(path: str, mappings: int) -> None:
+    "Write an smaps file with the given number of 8-24 kB mappings"
+    with open(path, 'w') as f:
+        for i in range(mappings):
+            size = 8 + (i % 3) * 8
+            f.write(MAPPING.format(start=i * 0x10000, end=i * 0x10000 + size * 1024,
+                                   size=size, pss=size // 2, shared=size // 2, private=size - size // 2))
+
+def old_rss_of_file(path: str) -> int:
+    "The text-mode line scan rss_mem_of_pid used before smaps_rollup support"
+    with open(path, 'r') as f:
+        rss = 0
+        for line in f:
+            if 'Rss:' in line:
+                rss += int(line.split()[1])
+        return rss
+
+def new_rss_of_file(path: str) -> int:
+    "The binary single-read path, restricted to Rss for a like-for-like comparison"
+    with open(path, 'rb') as f:
+        return sum(map(int, assignment2.SMAPS_FIELDS['rss'].findall(f.read())))
+
+def new_totals_of_file(path: str) -> object:
+    "The binary single-read path used by mem_of_pid when smaps_rollup is missing"
+    with open(path, 'rb') as f:
+        return assignment2.parse_smaps(f.read())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the old and new smaps parsers")
+    parser.add_argument("-m", "--mappings", type=int, default=50000, help="Number of mappings in the synthetic file. Default is 50000.")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Number of timed runs; the best one is reported. Default is 5.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'smaps')
+        write_synthetic_smaps(path, args.mappings)
+        print(f"synthetic smaps: {args.mappings} mappings, {os.path.getsize(path) / 1048576:.1f} MiB")
+
+        # Both paths must agree before their timings mean anything
+        assert old_rss_of_file(path) == new_rss_of_file(path) == new_totals_of_file(path).rss
+
+        old = min(timeit.repeat(lambda: old_rss_of_file(path), number=1, repeat=args.repeat))
+        new = min(timeit.repeat(lambda: new_rss_of_file(path), number=1, repeat=args.repeat))
+        totals = min(timeit.repeat(lambda: new_totals_of_file(path), number=1, repeat=args.repeat))
+        print(f"old text scan (Rss only):            {old * 1000:8.1f} ms")
+        print(f"new binary parser (Rss only):        {new * 1000:8.1f} ms  ({old / new:.1f}x)")
+        print(f"new binary parser (Rss/Pss/Sh/Priv): {totals * 1000:8.1f} ms")
+
+    if assignment2.HAVE_SMAPS_ROLLUP:
+        rollup = min(timeit.repeat(lambda: assignment2.mem_of_pid('self'), number=1, repeat=args.repeat))
+        print(f"smaps_rollup of this process:        {rollup * 1000:8.3f} ms")
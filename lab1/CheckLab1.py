@@ -34,241 +34,80 @@ Check a specific lab section
 Description:
 This script is used to give students feedback, progress, and
 assistance while working on labs. Labs and this script should be 
-in the same directory. Labs must use the correct naming scheme for
+in the same directory, and the shared engine labcheck.py must be
+next to them or one directory up; the update check prints how to
+refresh both. Labs must use the correct naming scheme for
 each file(eg. lab1a.py, lab1b.py, ...).
 
 
 """
-from __future__ import absolute_import, division, print_function, unicode_literals
-import subprocess
-import unittest
-import sys
 import os
-import hashlib
-import urllib.request
-import socket
-import time 
-
-
-
-class lab1a(unittest.TestCase):
-    """All test cases for lab1a - printing"""
-    
-    def test_0(self):
-        """[Lab 1] - [Investigation 3] - [Part 2] - printing - Test for file creation: ./lab1a.py"""
-        error_output = 'your file cannot be found(HINT: make sure you AND your file are in the correct directory)'
-        self.assertTrue(os.path.exists('./lab1a.py'), msg=error_output)
-        
-
-    def test_a(self):
-        """[Lab 1] - [Investigation 3] - [Part 2] - printing - Test for errors running: ./lab1a.py"""
-        # Run students program
-        p = subprocess.Popen(['/usr/bin/python3', './lab1a.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with a error(HINT: try running your program to see/read the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-
-    def test_a1(self):
-        """[Lab 1] - [Investigation 3] - [Part 2] - printing - Test for correct shebang line: ./lab1a.py"""
-        lab_file = open('./lab1a.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'your program does not have a shebang line(HINT: what should the first line contain)'
-        self.assertEqual(first_line, '#!/usr/bin/env python3\n', msg=error_output)
-
-
-    def test_b(self):
-        """[Lab 1] - [Investigation 3] - [Part 2] - printing - Test output for correct output "Hello world": ./lab1a.py"""
-        # Run students program
-        p = subprocess.Popen(['/usr/bin/python3', './lab1a.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, _ = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'Hello world\n'
-        error_output = 'output is not correct(HINT: pay attention to uppercase letters, spaces, and symbols)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-class lab1b(unittest.TestCase):
-    """All test cases for lab1b - string objects & printing"""
-   
-    def test_0(self):
-        """[Lab 1] - [Investigation 4] - string objects & printing - Test for file creation: ./lab1b.py"""
-        error_output = 'your file cannot be found(HINT: make sure you AND your file are in the correct directory)'
-        self.assertTrue( os.path.exists('./lab1b.py'), msg=error_output)
-
-    def test_a(self):
-        """[Lab 1] - [Investigation 4] - string objects & printing - Test for errors running: ./lab1b.py"""
-        # Run students program
-        p = subprocess.Popen(['/usr/bin/python3', './lab1b.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with a error(HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_a1(self):
-        """[Lab 1] - [Investigation 4] - string objects & printing - Test for correct shebang line: ./lab1b.py"""
-        lab_file = open('./lab1b.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'your program does not have a shebang line(HINT: what should the first line contain)'
-        self.assertEqual(first_line, '#!/usr/bin/env python3\n', msg=error_output)
-
-    def test_b(self):
-        """[Lab 1] - [Investigation 4] - string objects & printing - Test for correct output "How old are you Isaac?": ./lab1b.py"""
-        # Run students program
-        p = subprocess.Popen(['/usr/bin/python3', './lab1b.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, _ = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'How old are you Isaac?\n'
-        error_output = 'output is not correct(HINT: pay attention to uppercase letters, spaces, and punctuation)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-
-class lab1c(unittest.TestCase):
-    """All test cases for lab1c - integer objects & printing"""
-    
-    def test_0(self):
-        """[Lab 1] - [Investigation 4] - integer objects & printing - Test for file creation: ./lab1c.py"""
-        error_output = 'your file cannot be found(HINT: make sure you AND your file are in the correct directory)'
-        self.assertTrue( os.path.exists('./lab1c.py'), msg=error_output)
-
-    def test_a(self):
-        """[Lab 1] - [Investigation 4] - integer objects & printing - Test for errors running: ./lab1c.py"""
-        # Run students program
-        p = subprocess.Popen(['/usr/bin/python3', './lab1c.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with a error(HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_a1(self):
-        """[Lab 1] - [Investigation 4] - integer objects & printing - Test for correct shebang line: ./lab1c.py"""
-        lab_file = open('./lab1c.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'your program does not have a shebang line(HINT: what should the first line contain)'
-        self.assertEqual(first_line, '#!/usr/bin/env python3\n', msg=error_output)
-
-    def test_b(self):
-        """[Lab 1] - [Investigation 4] - integer objects & printing - Test output for correct output "Isaac is 72 years old!": ./lab1c.py"""
-        # Run students program
-        p = subprocess.Popen(['/usr/bin/python3', './lab1c.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, _ = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'Isaac is 72 years old!\n'
-        error_output = 'output is not correct(HINT: pay attention to uppercase letters, spaces, and punctuation)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-
-class lab1d(unittest.TestCase):
-    """All test cases for lab1d - Math Operators"""
-    
-    def test_0(self):
-        """[Lab 1] - [Investigation 5] - math operators - Test for file creation: ./lab1d.py"""
-        error_output = 'your file cannot be found(HINT: make sure you AND your file are in the correct directory)'
-        self.assertTrue( os.path.exists('./lab1d.py'), msg=error_output)
-
-    def test_a(self):
-        """[Lab 1] - [Investigation 5] - math operators - Test for errors running: ./lab1d.py"""
-        # Run students program
-        p = subprocess.Popen(['/usr/bin/python3', './lab1d.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with a error(HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_a1(self):
-        """[Lab 1] - [Investigation 5] - math operators - Test for correct shebang line: ./lab1d.py"""
-        lab_file = open('./lab1d.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'your program does not have a shebang line(HINT: what should the first line contain)'
-        self.assertEqual(first_line, '#!/usr/bin/env python3\n', msg=error_output)
-
-    def test_b(self):
-        """[Lab 1] - [Investigation 5] - math operators - Test output for correct output "10 + 2 * 5 = 20": ./lab1d.py"""
-        # Run students program
-        p = subprocess.Popen(['/usr/bin/python3', './lab1d.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, _ = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'10 + 2 * 5 = 20\n'
-        error_output = 'output is not correct(HINT: the program must have the exact output, this includes every space and symbol)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-   
-def ChecksumLatest(url=None):
-    dat = ''
-    with urllib.request.urlopen(url) as response:
-        for line in response:
-            line = line.decode('utf-8')
-            dat = dat + line
-    checksum = hashlib.sha256(dat.encode('utf-8')).digest()
-    #print("internet", checksum)
-    return checksum
-
-def ChecksumLocal(filename=None):
-    fil = open(filename, 'r', encoding='utf-8')
-    dat = fil.readlines()
-    textdata = ''
-    for line in dat:
-        textdata = textdata + line
-    checksum = hashlib.sha256(textdata.encode('utf-8')).digest()
-    #print("local", checksum)
-    return checksum
-
-def CheckForUpdates():
-    try:
-        lab_name = 'CheckLab1.py'
-        lab_num = 'lab1'
-        print('Checking for updates...')
-        if ChecksumLatest(url='https://ict.senecacollege.ca/~eric.brauer/ops445/labs/LabCheckScripts/' + lab_name) != ChecksumLocal(filename='./' + lab_name):
-            print()
-            print(' There is a update available for this' + lab_name + ' please consider updating:')
-            print(' cd ~/ops445/' + lab_num + '/')
-            print(' pwd  #   <-- i.e. confirm that you are in the correct directory')
-            print(' rm ' + lab_name)
-            print(' ls ' + lab_name + ' || wget https://ict.senecacollege.ca/~eric.brauer/ops445/labs/LabCheckScripts/' + lab_name)
-            print()
-            return
-        print('Running latest version...')
-        return
-    except:
-        # Cleanly skip updating if any errors occur for offline or matrix issues
-        print('No connection made...')
-        print('Skipping updates...')
-        return
+import sys
 
-def github_email():
-    cmd = 'git config --get user.email'
+try:
+    import labcheck
+except ImportError:
+    # In the course repository the shared engine sits one directory up
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
     try:
-        out = os.popen(cmd).read().strip()
-    except:
-        out = 'none found'
-    return out
-
-def displayReportHeader():
-    report_heading = 'OPS445 Lab Report - System Information for running '+sys.argv[0]
-    print(report_heading)
-    print(len(report_heading) * '=')
-    import getpass
-    print('    User login name:', getpass.getuser())
-    print('    Git Email:', github_email())
-    print('    Linux system name:', socket.gethostname())
-    print('    Python executable:',sys.executable)
-    print('    Python version: ',sys.version)
-    print('    OS Platform:',sys.platform)
-    print('    Working Directory:',os.getcwd())
-    print('    Start at:',time.asctime())
-    print(len(report_heading) * '=')
-    return
+        import labcheck
+    except ImportError:
+        sys.exit('CheckLab1.py needs labcheck.py in the same directory or one directory up, e.g.:\n'
+                 ' wget https://ict.senecacollege.ca/~eric.brauer/ops445/labs/LabCheckScripts/labcheck.py')
+from labcheck import Lab
+
+# Interpreter the student programs are run with
+PYTHON = '/usr/bin/python3'
+
+# (test, description, check, argv, stdin, expected, hint[, requires]); see labcheck.Spec for the checks
+LABS = [
+    Lab('lab1a', 'All test cases for lab1a - printing',
+        '[Lab 1] - [Investigation 3] - [Part 2] - printing - ', [
+        ('test_0', 'Test for file creation: ./lab1a.py', 'exists', './lab1a.py', b'', None,
+         'your file cannot be found(HINT: make sure you AND your file are in the correct directory)'),
+        ('test_a', 'Test for errors running: ./lab1a.py', 'returncode', './lab1a.py', b'', 0,
+         'your program exited with a error(HINT: try running your program to see/read the error)', 'test_0'),
+        ('test_a1', 'Test for correct shebang line: ./lab1a.py', 'shebang', './lab1a.py', b'', '#!/usr/bin/env python3\n',
+         'your program does not have a shebang line(HINT: what should the first line contain)', 'test_0'),
+        ('test_b', 'Test output for correct output "Hello world": ./lab1a.py', 'stdout', './lab1a.py', b'', b'Hello world\n',
+         'output is not correct(HINT: pay attention to uppercase letters, spaces, and symbols)', 'test_a'),
+    ]),
+    Lab('lab1b', 'All test cases for lab1b - string objects & printing',
+        '[Lab 1] - [Investigation 4] - string objects & printing - ', [
+        ('test_0', 'Test for file creation: ./lab1b.py', 'exists', './lab1b.py', b'', None,
+         'your file cannot be found(HINT: make sure you AND your file are in the correct directory)'),
+        ('test_a', 'Test for errors running: ./lab1b.py', 'returncode', './lab1b.py', b'', 0,
+         'your program exited with a error(HINT: try running your program to see the error)', 'test_0'),
+        ('test_a1', 'Test for correct shebang line: ./lab1b.py', 'shebang', './lab1b.py', b'', '#!/usr/bin/env python3\n',
+         'your program does not have a shebang line(HINT: what should the first line contain)', 'test_0'),
+        ('test_b', 'Test for correct output "How old are you Isaac?": ./lab1b.py', 'stdout', './lab1b.py', b'', b'How old are you Isaac?\n',
+         'output is not correct(HINT: pay attention to uppercase letters, spaces, and punctuation)', 'test_a'),
+    ]),
+    Lab('lab1c', 'All test cases for lab1c - integer objects & printing',
+        '[Lab 1] - [Investigation 4] - integer objects & printing - ', [
+        ('test_0', 'Test for file creation: ./lab1c.py', 'exists', './lab1c.py', b'', None,
+         'your file cannot be found(HINT: make sure you AND your file are in the correct directory)'),
+        ('test_a', 'Test for errors running: ./lab1c.py', 'returncode', './lab1c.py', b'', 0,
+         'your program exited with a error(HINT: try running your program to see the error)', 'test_0'),
+        ('test_a1', 'Test for correct shebang line: ./lab1c.py', 'shebang', './lab1c.py', b'', '#!/usr/bin/env python3\n',
+         'your program does not have a shebang line(HINT: what should the first line contain)', 'test_0'),
+        ('test_b', 'Test output for correct output "Isaac is 72 years old!": ./lab1c.py', 'stdout', './lab1c.py', b'', b'Isaac is 72 years old!\n',
+         'output is not correct(HINT: pay attention to uppercase letters, spaces, and punctuation)', 'test_a'),
+    ]),
+    Lab('lab1d', 'All test cases for lab1d - Math Operators',
+        '[Lab 1] - [Investigation 5] - math operators - ', [
+        ('test_0', 'Test for file creation: ./lab1d.py', 'exists', './lab1d.py', b'', None,
+         'your file cannot be found(HINT: make sure you AND your file are in the correct directory)'),
+        ('test_a', 'Test for errors running: ./lab1d.py', 'returncode', './lab1d.py', b'', 0,
+         'your program exited with a error(HINT: try running your program to see the error)', 'test_0'),
+        ('test_a1', 'Test for correct shebang line: ./lab1d.py', 'shebang', './lab1d.py', b'', '#!/usr/bin/env python3\n',
+         'your program does not have a shebang line(HINT: what should the first line contain)', 'test_0'),
+        ('test_b', 'Test output for correct output "10 + 2 * 5 = 20": ./lab1d.py', 'stdout', './lab1d.py', b'', b'10 + 2 * 5 = 20\n',
+         'output is not correct(HINT: the program must have the exact output, this includes every space and symbol)', 'test_a'),
+    ]),
+]
+
+globals().update(labcheck.build_tests(__name__, LABS))
 
 if __name__ == '__main__':
-    #CheckForUpdates()
-    #wait = input('Press ENTER to run the Lab Check...')
-    if len(sys.argv) == 3:
-        x = displayReportHeader()
-    unittest.main()
-
+    labcheck.main('CheckLab1.py', 'lab1', PYTHON)
@@ -21,513 +21,149 @@ Check a specific lab section
 Description:
 This script is used to give students more feedback, progress, and
 assistance while working on labs. Labs and this script should be 
-in the same directory. Labs must use the correct naming scheme for
+in the same directory, and the shared engine labcheck.py must be
+next to them or one directory up; the update check prints how to
+refresh both. Labs must use the correct naming scheme for
 each file(eg. lab2a.py, lab2b.py, ...).
 
 
 """
 
-import subprocess
-import unittest
-import sys
 import os
-import hashlib
-import urllib.request
-import socket
-import time
-
-class lab2a(unittest.TestCase):
-    """All test cases for lab2a - variables & printing"""
-
-    def test_0(self):
-        """[Lab 2] - [Investigation 1] - [Part 1] - variables & printing - Test for file creation: ./lab2a.py"""
-        error_output = 'your file cannot be found (HINT: make sure the CheckLab2.py script AND your lab files are in the correct directory)'
-        self.assertTrue(os.path.exists('./lab2a.py'), msg=error_output)
-    
-    def test_1(self):
-        """[Lab 2] - [Investigation 1] - [Part 1] - variables & printing - Test for errors running: ./lab2a.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2a.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with an error (HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-
-    def test_2(self):
-        """[Lab 2] - [Investigation 1] - [Part 1] - variables & printing - Test for correct shebang line: ./lab2a.py"""
-        lab_file = open('./lab2a.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'lab2a.py does not have the correct shebang line (HINT: what should the first line contain)'
-        self.assertEqual(first_line.strip(), '#!/usr/bin/env python3', msg=error_output)
-
-    def test_3(self):
-        """[Lab 2] - [Investigation 1] - [Part 1] - variables & printing - Test for correct output: ./lab2a.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2a.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, _ = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'Hi Jon, you are 20 years old.\n'
-        error_output = 'output is not correct (HINT: pay attention to uppercase letters, spaces, and punctuation)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-
-class lab2b(unittest.TestCase):
-    """All test cases for lab2b - variables & printing & input"""
-    
-    def test_0(self):
-        """[Lab 2] - [Investigation 1] - [Part 1] - using input() function - Test for file creation: ./lab2b.py"""
-        error_output = 'your file cannot be found (HINT: make sure your file are in the correct directory)'
-        self.assertTrue(os.path.exists('./lab2b.py'), msg=error_output)
-   
-    def test_1(self):
-        """[Lab 2] - [Investigation 1] - [Part 1] - using input() - Test for errors with sending input "Jon" "20": ./lab2b.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2b.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate(input=b'Jon\n20\n')
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your script exited with an error (HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_2(self):
-        """[Lab 2] - [Investigation 1] - [Part 1] - using input() - Test for correct shebang line: ./lab2b.py"""
-        lab_file = open('./lab2b.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'your script does not have a correct shebang line (HINT: what should the first line contain)'
-        self.assertEqual(first_line.strip(), '#!/usr/bin/env python3', msg=error_output)
-
-    def test_3(self):
-        """[Lab 2] - [Investigation 1] - [Part 1] - using input() - Test output with sending input "Jon" "20": ./lab2b.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2b.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate(input=b'Jon\n20\n')
-        # Fail test if output is different from expected_output
-        expected_output = b'Name: Age: Hi Jon, you are 20 years old.\n'
-        error_output = 'output is not correct (HINT: pay attention to spelling, uppercase letters, spaces, and punctuation)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-    def test_4(self):
-        """[Lab 2] - [Investigation 1] - [Part 1] - using input() - Test output with sending input "Jen" "25": ./lab2b.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2b.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate(input=b'Jen\n25\n')
-        # Fail test if output is different from expected_output
-        expected_output = b'Name: Age: Hi Jen, you are 25 years old.\n'
-        error_output = 'output is not correct (HINT: we are matching "Jen" and "25" now, take a look at python function input()'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-
-class lab2c(unittest.TestCase):
-    """All test cases for lab2c - using command line arguments"""
-    
-    def test_0(self):
-        """[Lab 2] - [Investigation 1] - [Part 2] - command line arguments - Test for file creation: ./lab2c.py"""
-        error_output = 'your file cannot be found (HINT: make sure your file are in the correct directory)'
-        self.assertTrue(os.path.exists('./lab2c.py'), msg=error_output)
-    
-    def test_1(self):
-        """[Lab 2] - [Investigation 1] - [Part 2] - command line arguments - Test for errors with 2 args: ./lab2c.py Jon 20"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2c.py', 'Jon', '20' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with an error (HINT: try running your script to see the error)'
-        self.assertEqual (return_code, 0, msg=error_output)
-    
-    def test_2(self):
-        """[Lab 2] - [Investigation 1] - [Part 2] - command line arguments - Test for correct shebang line: ./lab2c.py"""
-        lab_file = open('./lab2c.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'your script does not have a correct shebang line (HINT: what should the first line contain)'
-        self.assertEqual(first_line.strip(), '#!/usr/bin/env python3', msg=error_output)
-
-    def test_3(self):
-        """[Lab 2] - [Investigation 1] - [Part 2] - command line arguments - Test output for: ./lab2c.py Jon 20"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2c.py', 'Jon', '20' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, _ = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'Hi Jon, you are 20 years old.\n'
-        error_output = 'output is not correct (HINT: must use the sys.argv list, do not forget to import sys)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-    def test_4(self):
-        """[Lab 2] - [Investigation 1] - [Part 2] - command line arguments - Test output for: ./lab2c.py Jen 25"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2c.py', 'Jen', '25' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, _ = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'Hi Jen, you are 25 years old.\n'
-        error_output = 'output is not correct (HINT: must use the sys.argv list, do not forget to import sys)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-
-class lab2d(unittest.TestCase):
-    """All test cases for lab2d - arguments & if statements"""
-    
-    def test_0(self):
-        """[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - Test for file creation: ./lab2d.py"""
-        error_output = 'your script cannot be found (HINT: make sure AND your file are in the correct directory)'
-        self.assertTrue(os.path.exists('./lab2d.py'), msg=error_output)
-    
-    def test_1(self):
-        """[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - Test for errors with 0 args: ./lab2d.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2d.py' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with a error(HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_2(self):
-        """[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - Test for correct shebang line: ./lab2d.py"""
-        lab_file = open('./lab2d.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'your program does not have a correct shebang line (HINT: what should the first line contain)'
-        self.assertEqual(first_line.strip(), '#!/usr/bin/env python3', msg=error_output)
-    
-    def test_3(self):
-        """[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - Test for errors: ./lab2d.py Jon"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2d.py', 'Jon' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with a error(HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_4(self):
-        """[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - Test for errors: ./lab2d.py Jon 20"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2d.py', 'Jon', '20' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with an error (HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_5(self):
-        """[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - Test for errors: ./lab2d.py Jon 20 More"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2d.py', 'Jon', '20', 'More' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with an error (HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-
-    def test_6(self):
-        """[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - Test output with 0 args: ./lab2d.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2d.py' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'Usage: ./lab2d.py name age\n'
-        error_output = 'wrong usage message for 0 args (HINT: use if statements for catching conditions, such as 0 arguments)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-    def test_7(self):
-        """[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - Test output with 1 args: ./lab2d.py Jon"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2d.py', 'Jon' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'Usage: ./lab2d.py name age\n'
-        error_output = 'wrong usage message for 1 args(HINT: use if and elif statements for catching conditions, such as 1 argument)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-    def test_8(self):
-        """[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - Test output with 2 args: ./lab2d.py Jon 20"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2d.py', 'Jon', '20' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'Hi Jon, you are 20 years old.\n'
-        error_output = 'wrong output for correct number of args'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-    def test_9(self):
-        """[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - Test output with 3 args: ./lab2d.py Jon 20 More"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2d.py', 'Jon', '20', 'More' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'Usage: ./lab2d.py name age\n'
-        error_output = 'wrong usage message for 3 args(HINT: use the > or < signs in if statements, test for more then 2 arguments)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-
-class lab2e(unittest.TestCase):
-    """All test cases for lab2e - while loops"""
-    
-    def test_0(self):
-        """[Lab 2] - [Investigation 3] - [Part 1] - while loop with timer 10 - Test for file creation: ./lab2e.py"""
-        error_output = 'your file cannot be found (HINT: make sure your file are in the correct directory)'
-        self.assertTrue(os.path.exists('./lab2e.py'), msg=error_output)
-
-    def test_1(self):
-        """[Lab 2] - [Investigation 3] - [Part 1] - while loop with timer 10 - Test for errors: ./lab2e.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2e.py' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with a error(HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_2(self):
-        """[Lab 2] - [Investigation 3] - [Part 1] - while loop with timer 10 - Test for correct shebang line: ./lab2e.py"""
-        lab_file = open('./lab2e.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'your program does not have a shebang line(HINT: what should the first line contain)'
-        self.assertEqual(first_line.strip(), '#!/usr/bin/env python3', msg=error_output)
-
-    def test_4(self):
-        """[Lab 2] - [Investigation 3] - [Part 1] - while loop with timer 10 - Test for output: ./lab2e.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2e.py' ], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'10\n9\n8\n7\n6\n5\n4\n3\n2\n1\nblast off!\n'
-        error_output = 'wrong output (HINT: pay attention to the last number that is displayed, is it a 1 or a 0?)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-
-class lab2f(unittest.TestCase):
-    """All test cases for lab2f - while loops & sys.argv"""
-    
-    def test_0(self):
-        """[Lab 2] - [Investigation 3] - [Part 2] - while loops & sys.argv - Test for file creation: ./lab2f.py"""
-        error_output = 'your file cannot be found (HINT: make sure file are in the correct directory)'
-        self.assertTrue(os.path.exists('./lab2f.py'), msg=error_output)
-
-    def test_1(self):
-        """[Lab 2] - [Investigation 3] - [Part 2] - while loops & sys.argv - Test for errors with with 0 arguments): ./lab2f.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2f.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = '(HINT: this script should only be run with a argument)'
-        self.assertEqual(return_code, 1, msg=error_output)
-    
-    def test_2(self):
-        """[Lab 2] - [Investigation 3] - [Part 2] - while loops & sys.argv - Test for correct shebang line: ./lab2f.py"""
-        lab_file = open('./lab2f.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'your script does not have a correct shebang line (HINT: what should the first line contain)'
-        self.assertEqual(first_line.strip(), '#!/usr/bin/env python3', msg=error_output)
-
-    def test_4(self):
-        """[Lab 2] - [Investigation 3] - [Part 2] - while loops & sys.argv - Test for errors: ./lab2f.py 10"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2f.py', '10'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your script exited with an error (HINT: try running your program to see the error, careful not to mix up ints and strings)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_5(self):
-        """[Lab 2] - [Investigation 3] - [Part 2] - while loops & sys.argv - Test for errors: ./lab2f.py 5"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2f.py', '5'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your script exited with an error (HINT: try running your program to see the error, careful not to mix up ints and strings)'
-        self.assertEqual(return_code, 0, msg=error_output)
-
-    def test_6(self):
-        """[Lab 2] - [Investigation 3] - [Part 2] - while loops & sys.argv - Test output with: ./lab2f.py 10"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2f.py', '10'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'10\n9\n8\n7\n6\n5\n4\n3\n2\n1\nblast off!\n'
-        error_output = 'wrong output (HINT: check you script output carefully)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-    def test_7(self):
-        """[Lab 2] - [Investigation 3] - [Part 2] - while loops & sys.argv - Test output with: ./lab2f.py 5"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2f.py', '5'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'5\n4\n3\n2\n1\nblast off!\n'
-        error_output = 'wrong output(HINT: check you script output carefully)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-
-
-class lab2g(unittest.TestCase):
-    """All test cases for lab2g - while loops & sys.argv & if statements"""
-    
-    def test_0(self):
-        """[Lab 2] - [Investigation 3] - [Part 3] - while loops, sys.argv & if - Test for file creation: ./lab2g.py"""
-        error_output = 'your file cannot be found (HINT: make sure your file are in the correct directory)'
-        self.assertTrue(os.path.exists('./lab2g.py'), msg=error_output)
-
-    def test_1(self):
-        """[Lab 2] - [Investigation 3] - [Part 3] - while loops, sys.argv & if - Test for errors: ./lab2g.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2g.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your program exited with an error(HINT: try running your program to see the error)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_2(self):
-        """[Lab 2] - [Investigation 3] - [Part 3] - while loops, sys.argv & if - Test for correct shebang line: ./lab2g.py"""
-        lab_file = open('./lab2g.py')
-        first_line = lab_file.readline()
-        lab_file.close()
-        error_output = 'your script does not have a correct shebang line (HINT: what should the first line contain)'
-        self.assertEqual(first_line.strip(), '#!/usr/bin/env python3', msg=error_output)
- 
-    def test_4(self):
-        """[Lab 2] - [Investigation 3] - [Part 3] - while loops, sys.argv & if - Test for errors: ./lab2g.py 5"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2g.py', '5'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your script exited with an error (HINT: try running your program to see the error, careful not to mix up ints and strings)'
-        self.assertEqual(return_code, 0, msg=error_output)
-    
-    def test_5(self):
-        """[Lab 2] - [Investigation 3] - [Part 3] - while loops, sys.argv & if - Test for errors: ./lab2g.py 10"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2g.py', '10'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if process returns a no zero exit status
-        return_code = p.wait()
-        error_output = 'your script exited with an error (HINT: try running your program to see the error, careful not to mix up ints and strings)'
-        self.assertEqual(return_code, 0, msg=error_output)
-
-    def test_6(self):
-        """[Lab 2] - [Investigation 3] - [Part 3] - while loops, sys.argv & if - Test output with no arguments: ./lab2g.py"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2g.py'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'3\n2\n1\nblast off!\n'
-        error_output = 'wrong output(HINT: should loop 3 times by default )'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-    def test_7(self):
-        """[Lab 2] - [Investigation 3] - [Part 3] - while loops, sys.argv & if - Test output with: ./lab2g.py 5"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2g.py', '5'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'5\n4\n3\n2\n1\nblast off!\n'
-        error_output = 'wrong output(HINT: should loop 5 times.)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-    
-    def test_8(self):
-        """[Lab 2] - [Investigation 3] - [Part 3] - while loops, sys.argv & if - Test output with: ./lab2g.py 10"""
-        # Run students program
-        p = subprocess.Popen([sys.executable, './lab2g.py', '10'], stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdout, err = p.communicate()
-        # Fail test if output is different from expected_output
-        expected_output = b'10\n9\n8\n7\n6\n5\n4\n3\n2\n1\nblast off!\n'
-        error_output = 'wrong output(HINT: should loop 10 times)'
-        self.assertEqual(stdout, expected_output, msg=error_output)
-
-class lab2out(unittest.TestCase):
-    """If lab2 output exists, verify the git email"""
-    
-    def test_0(self):
-        """[Lab 2 Output and Email Verification]"""
-        error_output = 'Make sure you are using your myseneca email address for git. Hint: run git config --global user.email "yoursenecaid@myseneca.ca" in your terminal.'
-        if os.path.exists('./laboutput.txt'):
-            with open('./laboutput.txt') as f:
-                output = f.read()
-            self.assertIn('@myseneca.ca', output, msg=error_output)
-        else:
-            assert True
-
-def ChecksumLatest(url=None):
-    dat = ''
-    with urllib.request.urlopen(url) as response:
-        for line in response:
-            line = line.decode('utf-8')
-            dat = dat + line
-    checksum = hashlib.sha256(dat.encode('utf-8')).digest()
-    #print("internet", checksum)
-    return checksum
-
-def ChecksumLocal(filename=None):
-    fil = open(filename, 'r', encoding='utf-8')
-    dat = fil.readlines()
-    textdata = ''
-    for line in dat:
-        textdata = textdata + line
-    checksum = hashlib.sha256(textdata.encode('utf-8')).digest()
-    #print("local", checksum)
-    return checksum
-
-def CheckForUpdates():
-    try:
-        lab_name = 'CheckLab2.py'
-        lab_num = 'lab2'
-        print('Checking for updates...')
-        if ChecksumLatest(url='https://ict.senecacollege.ca/~eric.brauer/ops445/labs/LabCheckScripts/' + lab_name) != ChecksumLocal(filename='./' + lab_name):
-            print()
-            print(' There is a update available for this' + lab_name + ' please consider updating:')
-            print(' cd ~/ops445/' + lab_num + '/')
-            print(' pwd  #   <-- i.e. confirm that you are in the correct directory')
-            print(' rm ' + lab_name)
-            print(' ls ' + lab_name + ' || wget https://ict.senecacollege.ca/~eric.brauer/ops445/labs/LabCheckScripts/' + lab_name)
-            print()
-            return
-        print('Running latest version...')
-        return
-    except:
-        # Cleanly skip updating if any errors occur for offline or matrix issues
-        print('No connection made...')
-        print('Skipping updates...')
-        return
+import sys
 
-def github_email():
-    cmd = 'git config --get user.email'
+try:
+    import labcheck
+except ImportError:
+    # In the course repository the shared engine sits one directory up
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
     try:
-        out = os.popen(cmd).read().strip()
-    except:
-        out = 'none found'
-    return out
-
-def displayReportHeader():
-    report_heading = 'OPS445 Lab Report - System Information for running '+sys.argv[0]
-    print(report_heading)
-    print(len(report_heading) * '=')
-    import getpass
-    print('    User login name:', getpass.getuser())
-    print('    Git Email:', github_email())
-    print('    Linux system name:', socket.gethostname())
-    print('    Python executable:',sys.executable)
-    print('    Python version: ',sys.version)
-    print('    OS Platform:',sys.platform)
-    print('    Working Directory:',os.getcwd())
-    print('    Start at:',time.asctime())
-    print(len(report_heading) * '=')
-    return
+        import labcheck
+    except ImportError:
+        sys.exit('CheckLab2.py needs labcheck.py in the same directory or one directory up, e.g.:\n'
+                 ' wget https://ict.senecacollege.ca/~eric.brauer/ops445/labs/LabCheckScripts/labcheck.py')
+from labcheck import Lab
+
+# Interpreter the student programs are run with
+PYTHON = sys.executable
+
+# (test, description, check, argv, stdin, expected, hint[, requires]); see labcheck.Spec for the checks
+LABS = [
+    Lab('lab2a', 'All test cases for lab2a - variables & printing',
+        '[Lab 2] - [Investigation 1] - [Part 1] - variables & printing - ', [
+        ('test_0', 'Test for file creation: ./lab2a.py', 'exists', './lab2a.py', b'', None,
+         'your file cannot be found (HINT: make sure the CheckLab2.py script AND your lab files are in the correct directory)'),
+        ('test_1', 'Test for errors running: ./lab2a.py', 'returncode', './lab2a.py', b'', 0,
+         'your program exited with an error (HINT: try running your program to see the error)', 'test_0'),
+        ('test_2', 'Test for correct shebang line: ./lab2a.py', 'shebang', './lab2a.py', b'', '#!/usr/bin/env python3',
+         'lab2a.py does not have the correct shebang line (HINT: what should the first line contain)', 'test_0'),
+        ('test_3', 'Test for correct output: ./lab2a.py', 'stdout', './lab2a.py', b'', b'Hi Jon, you are 20 years old.\n',
+         'output is not correct (HINT: pay attention to uppercase letters, spaces, and punctuation)', 'test_1'),
+    ]),
+    Lab('lab2b', 'All test cases for lab2b - variables & printing & input',
+        '[Lab 2] - [Investigation 1] - [Part 1] - ', [
+        ('test_0', 'using input() function - Test for file creation: ./lab2b.py', 'exists', './lab2b.py', b'', None,
+         'your file cannot be found (HINT: make sure your file are in the correct directory)'),
+        ('test_1', 'using input() - Test for errors with sending input "Jon" "20": ./lab2b.py', 'returncode', './lab2b.py', b'Jon\n20\n', 0,
+         'your script exited with an error (HINT: try running your program to see the error)', 'test_0'),
+        ('test_2', 'using input() - Test for correct shebang line: ./lab2b.py', 'shebang', './lab2b.py', b'', '#!/usr/bin/env python3',
+         'your script does not have a correct shebang line (HINT: what should the first line contain)', 'test_0'),
+        ('test_3', 'using input() - Test output with sending input "Jon" "20": ./lab2b.py', 'stdout', './lab2b.py', b'Jon\n20\n', b'Name: Age: Hi Jon, you are 20 years old.\n',
+         'output is not correct (HINT: pay attention to spelling, uppercase letters, spaces, and punctuation)', 'test_1'),
+        ('test_4', 'using input() - Test output with sending input "Jen" "25": ./lab2b.py', 'stdout', './lab2b.py', b'Jen\n25\n', b'Name: Age: Hi Jen, you are 25 years old.\n',
+         'output is not correct (HINT: we are matching "Jen" and "25" now, take a look at python function input()', 'test_0'),
+    ]),
+    Lab('lab2c', 'All test cases for lab2c - using command line arguments',
+        '[Lab 2] - [Investigation 1] - [Part 2] - command line arguments - ', [
+        ('test_0', 'Test for file creation: ./lab2c.py', 'exists', './lab2c.py', b'', None,
+         'your file cannot be found (HINT: make sure your file are in the correct directory)'),
+        ('test_1', 'Test for errors with 2 args: ./lab2c.py Jon 20', 'returncode', './lab2c.py Jon 20', b'', 0,
+         'your program exited with an error (HINT: try running your script to see the error)', 'test_0'),
+        ('test_2', 'Test for correct shebang line: ./lab2c.py', 'shebang', './lab2c.py', b'', '#!/usr/bin/env python3',
+         'your script does not have a correct shebang line (HINT: what should the first line contain)', 'test_0'),
+        ('test_3', 'Test output for: ./lab2c.py Jon 20', 'stdout', './lab2c.py Jon 20', b'', b'Hi Jon, you are 20 years old.\n',
+         'output is not correct (HINT: must use the sys.argv list, do not forget to import sys)', 'test_1'),
+        ('test_4', 'Test output for: ./lab2c.py Jen 25', 'stdout', './lab2c.py Jen 25', b'', b'Hi Jen, you are 25 years old.\n',
+         'output is not correct (HINT: must use the sys.argv list, do not forget to import sys)', 'test_0'),
+    ]),
+    Lab('lab2d', 'All test cases for lab2d - arguments & if statements',
+        '[Lab 2] - [Investigation 2] - [Part 1] - sys.argv and if - ', [
+        ('test_0', 'Test for file creation: ./lab2d.py', 'exists', './lab2d.py', b'', None,
+         'your script cannot be found (HINT: make sure AND your file are in the correct directory)'),
+        ('test_1', 'Test for errors with 0 args: ./lab2d.py', 'returncode', './lab2d.py', b'', 0,
+         'your program exited with a error(HINT: try running your program to see the error)', 'test_0'),
+        ('test_2', 'Test for correct shebang line: ./lab2d.py', 'shebang', './lab2d.py', b'', '#!/usr/bin/env python3',
+         'your program does not have a correct shebang line (HINT: what should the first line contain)', 'test_0'),
+        ('test_3', 'Test for errors: ./lab2d.py Jon', 'returncode', './lab2d.py Jon', b'', 0,
+         'your program exited with a error(HINT: try running your program to see the error)', 'test_0'),
+        ('test_4', 'Test for errors: ./lab2d.py Jon 20', 'returncode', './lab2d.py Jon 20', b'', 0,
+         'your program exited with an error (HINT: try running your program to see the error)', 'test_0'),
+        ('test_5', 'Test for errors: ./lab2d.py Jon 20 More', 'returncode', './lab2d.py Jon 20 More', b'', 0,
+         'your program exited with an error (HINT: try running your program to see the error)', 'test_0'),
+        ('test_6', 'Test output with 0 args: ./lab2d.py', 'stdout', './lab2d.py', b'', b'Usage: ./lab2d.py name age\n',
+         'wrong usage message for 0 args (HINT: use if statements for catching conditions, such as 0 arguments)', 'test_1'),
+        ('test_7', 'Test output with 1 args: ./lab2d.py Jon', 'stdout', './lab2d.py Jon', b'', b'Usage: ./lab2d.py name age\n',
+         'wrong usage message for 1 args(HINT: use if and elif statements for catching conditions, such as 1 argument)', 'test_3'),
+        ('test_8', 'Test output with 2 args: ./lab2d.py Jon 20', 'stdout', './lab2d.py Jon 20', b'', b'Hi Jon, you are 20 years old.\n',
+         'wrong output for correct number of args', 'test_4'),
+        ('test_9', 'Test output with 3 args: ./lab2d.py Jon 20 More', 'stdout', './lab2d.py Jon 20 More', b'', b'Usage: ./lab2d.py name age\n',
+         'wrong usage message for 3 args(HINT: use the > or < signs in if statements, test for more then 2 arguments)', 'test_5'),
+    ]),
+    Lab('lab2e', 'All test cases for lab2e - while loops',
+        '[Lab 2] - [Investigation 3] - [Part 1] - while loop with timer 10 - ', [
+        ('test_0', 'Test for file creation: ./lab2e.py', 'exists', './lab2e.py', b'', None,
+         'your file cannot be found (HINT: make sure your file are in the correct directory)'),
+        ('test_1', 'Test for errors: ./lab2e.py', 'returncode', './lab2e.py', b'', 0,
+         'your program exited with a error(HINT: try running your program to see the error)', 'test_0'),
+        ('test_2', 'Test for correct shebang line: ./lab2e.py', 'shebang', './lab2e.py', b'', '#!/usr/bin/env python3',
+         'your program does not have a shebang line(HINT: what should the first line contain)', 'test_0'),
+        ('test_4', 'Test for output: ./lab2e.py', 'stdout', './lab2e.py', b'', b'10\n9\n8\n7\n6\n5\n4\n3\n2\n1\nblast off!\n',
+         'wrong output (HINT: pay attention to the last number that is displayed, is it a 1 or a 0?)', 'test_1'),
+    ]),
+    Lab('lab2f', 'All test cases for lab2f - while loops & sys.argv',
+        '[Lab 2] - [Investigation 3] - [Part 2] - while loops & sys.argv - ', [
+        ('test_0', 'Test for file creation: ./lab2f.py', 'exists', './lab2f.py', b'', None,
+         'your file cannot be found (HINT: make sure file are in the correct directory)'),
+        ('test_1', 'Test for errors with with 0 arguments): ./lab2f.py', 'returncode', './lab2f.py', b'', 1,
+         '(HINT: this script should only be run with a argument)', 'test_0'),
+        ('test_2', 'Test for correct shebang line: ./lab2f.py', 'shebang', './lab2f.py', b'', '#!/usr/bin/env python3',
+         'your script does not have a correct shebang line (HINT: what should the first line contain)', 'test_0'),
+        ('test_4', 'Test for errors: ./lab2f.py 10', 'returncode', './lab2f.py 10', b'', 0,
+         'your script exited with an error (HINT: try running your program to see the error, careful not to mix up ints and strings)', 'test_0'),
+        ('test_5', 'Test for errors: ./lab2f.py 5', 'returncode', './lab2f.py 5', b'', 0,
+         'your script exited with an error (HINT: try running your program to see the error, careful not to mix up ints and strings)', 'test_0'),
+        ('test_6', 'Test output with: ./lab2f.py 10', 'stdout', './lab2f.py 10', b'', b'10\n9\n8\n7\n6\n5\n4\n3\n2\n1\nblast off!\n',
+         'wrong output (HINT: check you script output carefully)', 'test_4'),
+        ('test_7', 'Test output with: ./lab2f.py 5', 'stdout', './lab2f.py 5', b'', b'5\n4\n3\n2\n1\nblast off!\n',
+         'wrong output(HINT: check you script output carefully)', 'test_5'),
+    ]),
+    Lab('lab2g', 'All test cases for lab2g - while loops & sys.argv & if statements',
+        '[Lab 2] - [Investigation 3] - [Part 3] - while loops, sys.argv & if - ', [
+        ('test_0', 'Test for file creation: ./lab2g.py', 'exists', './lab2g.py', b'', None,
+         'your file cannot be found (HINT: make sure your file are in the correct directory)'),
+        ('test_1', 'Test for errors: ./lab2g.py', 'returncode', './lab2g.py', b'', 0,
+         'your program exited with an error(HINT: try running your program to see the error)', 'test_0'),
+        ('test_2', 'Test for correct shebang line: ./lab2g.py', 'shebang', './lab2g.py', b'', '#!/usr/bin/env python3',
+         'your script does not have a correct shebang line (HINT: what should the first line contain)', 'test_0'),
+        ('test_4', 'Test for errors: ./lab2g.py 5', 'returncode', './lab2g.py 5', b'', 0,
+         'your script exited with an error (HINT: try running your program to see the error, careful not to mix up ints and strings)', 'test_0'),
+        ('test_5', 'Test for errors: ./lab2g.py 10', 'returncode', './lab2g.py 10', b'', 0,
+         'your script exited with an error (HINT: try running your program to see the error, careful not to mix up ints and strings)', 'test_0'),
+        ('test_6', 'Test output with no arguments: ./lab2g.py', 'stdout', './lab2g.py', b'', b'3\n2\n1\nblast off!\n',
+         'wrong output(HINT: should loop 3 times by default )', 'test_1'),
+        ('test_7', 'Test output with: ./lab2g.py 5', 'stdout', './lab2g.py 5', b'', b'5\n4\n3\n2\n1\nblast off!\n',
+         'wrong output(HINT: should loop 5 times.)', 'test_4'),
+        ('test_8', 'Test output with: ./lab2g.py 10', 'stdout', './lab2g.py 10', b'', b'10\n9\n8\n7\n6\n5\n4\n3\n2\n1\nblast off!\n',
+         'wrong output(HINT: should loop 10 times)', 'test_5'),
+    ]),
+    Lab('lab2out', 'If lab2 output exists, verify the git email',
+        '', [
+        ('test_0', '[Lab 2 Output and Email Verification]', 'contains', './laboutput.txt', b'', '@myseneca.ca',
+         'Make sure you are using your myseneca email address for git. Hint: run git config --global user.email "yoursenecaid@myseneca.ca" in your terminal.'),
+    ]),
+]
+
+globals().update(labcheck.build_tests(__name__, LABS))
 
 if __name__ == '__main__':
-    # CheckForUpdates()
-    # wait = input('Press ENTER to run the Lab Check ...')
-
-    if len(sys.argv) == 3:
-         x = displayReportHeader()
-
-    unittest.main()
-
-
+    labcheck.main('CheckLab2.py', 'lab2', PYTHON)
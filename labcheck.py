@@ -0,0 +1,1334 @@
+#!/usr/bin/env python3
+
+"""
+Name: labcheck.py
+
+Usage:
+Imported by the lab checkers (CheckLab1.py, CheckLab2.py, ...), which hold
+nothing but a table of specs and a call to labcheck.main():
+./CheckLab2.py -f -v
+./CheckLab2.py -f -v lab2x
+./CheckLab2.py -f -v --watch
+
+Description:
+Shared engine for the lab checkers. Each lab is declared as a table of
+specs (test name, description, check, argv, stdin, expected value, hint)
+and build_tests() turns the table into unittest TestCase classes. Before
+the tests run, the student programs they need are planned so that each
+unique run starts once, and every checker gets the same runner, engines,
+caches, result formats and update check.
+"""
+
+# Modules only some features need (urllib, subprocess, json, ast, ...) are imported where they are
+# used, so a checker starts without paying for the network stack or engines it does not run
+import argparse
+import atexit
+import resource
+import signal
+import unittest
+import sys
+import os
+import threading
+import time
+from collections import namedtuple
+
+# Interpreter the student programs are run with, and the checker and lab being run; set by main()
+PYTHON = sys.executable
+CHECKER = None
+LAB = None
+
+# Where CheckForUpdates looks for the latest checkers; any urllib URL works, e.g. a file:// mirror
+UPDATE_URL = 'https://ict.senecacollege.ca/~eric.brauer/ops445/labs/LabCheckScripts/'
+CHUNK_SIZE = 64 * 1024
+# Seconds the background update check may take, and how long a fetched checksum is trusted
+UPDATE_TIMEOUT = 3
+UPDATE_TTL = 24 * 60 * 60
+# Seconds to wait before trying again after a failed check, doubled on every failure in a row up to UPDATE_TTL
+UPDATE_RETRY = 15 * 60
+
+def sha256_stream(stream):
+    """Hash everything left in a binary stream, CHUNK_SIZE bytes at a time"""
+    import hashlib
+    checksum = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+        checksum.update(chunk)
+    return checksum
+
+def ChecksumLatest(url=None):
+    import urllib.request
+    with urllib.request.urlopen(url) as response:
+        checksum = sha256_stream(response).digest()
+    #print("internet", checksum)
+    return checksum
+
+def ChecksumLocal(filename=None):
+    with open(filename, 'rb') as fil:
+        checksum = sha256_stream(fil).digest()
+    #print("local", checksum)
+    return checksum
+
+def latest_checksum(url, state_file=None):
+    """Checksum of the file at url, remembered in state_file for UPDATE_TTL seconds
+
+    Once the TTL is up the request carries the saved ETag and Last-Modified,
+    so an unchanged file costs a 304 instead of a download.
+    """
+    state = load_update_state(state_file)
+    saved = state.get(url, {})
+    if saved.get('checksum') and time.time() - saved.get('checked', 0) < UPDATE_TTL:
+        return bytes.fromhex(saved['checksum'])
+    import urllib.error
+    import urllib.request
+    request = urllib.request.Request(url)
+    if saved.get('checksum'):
+        if saved.get('etag'):
+            request.add_header('If-None-Match', saved['etag'])
+        if saved.get('modified'):
+            request.add_header('If-Modified-Since', saved['modified'])
+    try:
+        with urllib.request.urlopen(request, timeout=UPDATE_TIMEOUT) as response:
+            checksum = sha256_stream(response).digest()
+            saved = {'checksum': checksum.hex(), 'etag': response.headers.get('ETag'), 'modified': response.headers.get('Last-Modified')}
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not saved.get('checksum'):
+            raise
+        checksum = bytes.fromhex(saved['checksum'])
+    saved['checked'] = time.time()
+    state[url] = saved
+    save_update_state(state_file, state)
+    return checksum
+
+def load_update_state(state_file):
+    """The saved update check state, {url: details}, or {} if there is none"""
+    import json
+    if state_file:
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+def save_update_state(state_file, state):
+    import json
+    if not state_file:
+        return
+    try:
+        os.makedirs(os.path.dirname(state_file), exist_ok=True)
+        temp = f'{state_file}.{os.getpid()}.{threading.get_ident()}'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp, state_file)
+    except OSError:
+        pass
+
+def update_recently_failed(url, state_file):
+    """Whether a check against url failed too recently to try again, see UPDATE_RETRY"""
+    failed = load_update_state(state_file).get(url, {})
+    retry = min(UPDATE_TTL, UPDATE_RETRY * 2 ** (failed.get('failures', 1) - 1))
+    return time.time() - failed.get('failed', 0) < retry
+
+def remember_update_result(url, state_file, failed):
+    """Start or extend the backoff for url after a failed check, or end it after one that worked"""
+    state = load_update_state(state_file)
+    if failed:
+        state[url] = {'failed': time.time(), 'failures': state.get(url, {}).get('failures', 0) + 1}
+    elif url in state:
+        del state[url]
+    else:
+        return
+    save_update_state(state_file, state)
+
+def update_verdict(url=UPDATE_URL, state_file=None):
+    """The lines CheckForUpdates prints once it knows whether this checker and labcheck.py are the latest
+
+    An unreachable server is not asked again until its backoff is over, so an
+    offline machine only waits for the timeout once in a while.
+    """
+    if update_recently_failed(url, state_file):
+        return ['No connection made...', 'Skipping updates...']
+    import urllib.error
+    lab_name = CHECKER
+    lab_num = LAB
+    # The checker is run from the lab directory; the engine may sit next to it or one directory up
+    files = [(lab_name, lab_name), ('labcheck.py', os.path.relpath(os.path.abspath(__file__)))]
+    outdated = []
+    for name, path in files:
+        try:
+            latest = latest_checksum(url + name, state_file)
+        except urllib.error.HTTPError:
+            # The server answered but has no such file, so there is nothing to update it to
+            if name == lab_name:
+                return ['No connection made...', 'Skipping updates...']
+            continue
+        except OSError:
+            # Offline, or the server did not answer in time: try again once the backoff is over
+            remember_update_result(url, state_file, failed=True)
+            return ['No connection made...', 'Skipping updates...']
+        except:
+            # Cleanly skip updating if any other errors occur for matrix issues
+            return ['No connection made...', 'Skipping updates...']
+        try:
+            local = ChecksumLocal(filename='./' + path)
+        except OSError:
+            local = None
+        if latest != local:
+            outdated.append((name, path))
+    remember_update_result(url, state_file, failed=False)
+    if not outdated:
+        return ['Running latest version...']
+    lines = ['',
+             ' There is a update available for ' + ' and '.join(name for name, _ in outdated) + ' please consider updating:',
+             ' cd ~/ops445/' + lab_num + '/',
+             ' pwd  #   <-- i.e. confirm that you are in the correct directory']
+    for name, path in outdated:
+        lines += [' rm ' + path,
+                  ' ls ' + path + ' || wget ' + ('' if path == name else '-O ' + path + ' ') + url + name]
+    return lines + ['']
+
+def CheckForUpdates(url=UPDATE_URL):
+    print('Checking for updates...')
+    for line in update_verdict(url):
+        print(line)
+    return
+
+class UpdateCheck(threading.Thread):
+    """Work out the update verdict on a daemon thread while the tests run, and print it at the end"""
+
+    def __init__(self, url, state_file):
+        super().__init__(daemon=True)
+        self.url = url
+        self.state_file = state_file
+        self.lines = ['No connection made...', 'Skipping updates...']
+        self.deadline = None
+
+    def start(self):
+        self.deadline = time.monotonic() + UPDATE_TIMEOUT
+        super().start()
+
+    def run(self):
+        self.lines = update_verdict(self.url, self.state_file)
+
+    def report(self, stream=None):
+        # The tests ran meanwhile, so only wait for what is left of UPDATE_TIMEOUT. A stalled DNS
+        # lookup is not covered by the urlopen timeout; count it as a failure if it is still going.
+        self.join(max(0.0, self.deadline - time.monotonic()))
+        if self.is_alive():
+            remember_update_result(self.url, self.state_file, failed=True)
+        for line in self.lines:
+            print(line, file=stream)
+
+def github_email():
+    cmd = 'git config --get user.email'
+    try:
+        out = os.popen(cmd).read().strip()
+    except:
+        out = 'none found'
+    return out
+
+def displayReportHeader():
+    report_heading = 'OPS445 Lab Report - System Information for running '+sys.argv[0]
+    print(report_heading)
+    print(len(report_heading) * '=')
+    import getpass
+    import socket
+    print('    User login name:', getpass.getuser())
+    print('    Git Email:', github_email())
+    print('    Linux system name:', socket.gethostname())
+    print('    Python executable:',sys.executable)
+    print('    Python version: ',sys.version)
+    print('    OS Platform:',sys.platform)
+    print('    Working Directory:',os.getcwd())
+    print('    Start at:',time.asctime())
+    print(len(report_heading) * '=')
+    return
+
+# Results of student programs that already ran, with their wall time, keyed by (script sha256, argv, stdin, interpreter)
+run_cache = {}
+run_cache_lock = threading.Lock()
+# Per thread: wall time of the student programs the current test used (seconds), and how
+# long the test actually spent inside run_program (waited), which is less for shared runs
+program_time = threading.local()
+# One dict per program run: args, engine, spawn and run seconds, child cpu seconds, max_rss_kb,
+# output sizes and status; None where an engine cannot measure a value
+program_profiles = []
+
+def file_digest(filename):
+    """Return the sha256 of a file's contents, or None if it cannot be read"""
+    try:
+        with open(filename, 'rb') as f:
+            return sha256_stream(f).hexdigest()
+    except OSError:
+        return None
+
+def run_program(args, stdin=b'', interpreter=None):
+    """Run a student program and return (stdout, stderr, return code)
+
+    Each unique (script content, argv, stdin, interpreter) runs once and the
+    result is shared by every test that asks for it, even tests running at
+    the same time on other threads. Raises ProgramTimeout if the program was
+    stopped after --timeout seconds.
+    """
+    called = time.perf_counter()
+    interpreter = interpreter or PYTHON
+    digest = file_digest(args[0])
+    key = (digest, tuple(args), stdin, interpreter)
+    with run_cache_lock:
+        entry = run_cache.setdefault(key, [threading.Lock(), None, 0.0])
+    with entry[0]:
+        if entry[1] is None:
+            profile = {'args': ' '.join(args)}
+            start = time.perf_counter()
+            # rlimits need a process of their own, so limited runs never go in-process
+            inprocess = ENGINE == 'inprocess' and not (CPU_LIMIT or MEM_LIMIT)
+            code = sandboxed_code(args[0], digest) if inprocess else None
+            if code is not None:
+                entry[1] = run_inprocess(code, args, stdin, profile)
+            elif ENGINE != 'subprocess' and hasattr(os, 'fork'):
+                entry[1] = zygote_pool(interpreter).run(args, stdin, profile)
+            else:
+                entry[1] = run_subprocess(args, stdin, interpreter, profile)
+            entry[2] = time.perf_counter() - start
+            profile.update(run=entry[2], stdout_bytes=len(entry[1][0]), stderr_bytes=len(entry[1][1]), status=entry[1][2])
+            program_profiles.append(profile)
+    program_time.seconds = getattr(program_time, 'seconds', 0.0) + entry[2]
+    program_time.waited = getattr(program_time, 'waited', 0.0) + time.perf_counter() - called
+    if entry[1][2] is None:
+        raise ProgramTimeout(' '.join(args) + f' did not finish within {TIMEOUT:g} seconds')
+    return entry[1]
+
+class ProgramTimeout(AssertionError):
+    """A student program was stopped after running longer than --timeout"""
+
+# Wall-clock seconds a student program may run, and its CPU seconds and address space in MB (None for no limit)
+TIMEOUT = 10.0
+CPU_LIMIT = None
+MEM_LIMIT = None
+
+def resource_limits():
+    """The (resource, limit) pairs to apply to a student program"""
+    limits = []
+    if CPU_LIMIT:
+        limits.append((resource.RLIMIT_CPU, CPU_LIMIT))
+    if MEM_LIMIT:
+        limits.append((resource.RLIMIT_AS, MEM_LIMIT * 1024 * 1024))
+    return limits
+
+def apply_resource_limits():
+    """preexec_fn for student programs; runs in the child before the interpreter starts"""
+    for limit, value in resource_limits():
+        resource.setrlimit(limit, (value, value))
+
+def child_usage(profile, before, after):
+    """Fill in profile's cpu and max_rss_kb from RUSAGE_CHILDREN readings taken around one child
+
+    ru_maxrss is the largest child so far, so a child's peak only shows when it
+    sets a new record. With --jobs above 1 other children can land in the delta.
+    """
+    profile['cpu'] = after.ru_utime - before.ru_utime + after.ru_stime - before.ru_stime
+    profile['max_rss_kb'] = after.ru_maxrss if after.ru_maxrss > before.ru_maxrss else None
+
+def run_subprocess(args, stdin, interpreter, profile=None):
+    """Run a student program in a fresh interpreter, in its own session so it can be killed with its children"""
+    profile = {} if profile is None else profile
+    profile['engine'] = 'subprocess'
+    import subprocess
+    preexec = apply_resource_limits if CPU_LIMIT or MEM_LIMIT else None
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    p = subprocess.Popen([interpreter] + list(args), stdout=subprocess.PIPE, stdin=subprocess.PIPE, stderr=subprocess.PIPE,
+                         start_new_session=True, preexec_fn=preexec)
+    profile['spawn'] = time.perf_counter() - start
+    try:
+        stdout, err = p.communicate(input=stdin, timeout=TIMEOUT)
+        status = p.wait()
+    except subprocess.TimeoutExpired:
+        os.killpg(p.pid, signal.SIGKILL)
+        stdout, err = p.communicate()
+        status = None
+    child_usage(profile, before, resource.getrusage(resource.RUSAGE_CHILDREN))
+    return stdout, err, status
+
+# How run_program executes student programs: 'subprocess', 'zygote' (forked from a warm
+# interpreter), or 'inprocess' (falling back to 'zygote' for scripts it cannot sandbox)
+ENGINE = 'subprocess'
+
+# What a script may use and still run inside the checker; anything else gets a real interpreter
+SANDBOX_MODULES = {'sys'}
+SANDBOX_SYS_NAMES = {'argv', 'exit', 'stdin', 'stdout', 'stderr'}
+SANDBOX_UNSAFE_CALLS = {'input', 'open', 'exec', 'eval', 'compile', '__import__', 'breakpoint',
+                        'getattr', 'setattr', 'delattr', 'globals', 'vars', 'locals'}
+# The only dunder name a sandboxed script may use, for if __name__ == '__main__':
+SANDBOX_DUNDERS = {'__name__'}
+# Names of the ast node types a sandboxed script may use; any other (with, class, global, yield, del,
+# ...) sends the script to a subprocess
+SANDBOX_NODES = {'Module', 'Expr', 'Assign', 'AugAssign', 'AnnAssign', 'Pass', 'Break', 'Continue', 'If', 'For',
+                 'While', 'Try', 'ExceptHandler', 'Raise', 'Assert', 'Import', 'alias', 'FunctionDef', 'arguments',
+                 'arg', 'Return', 'Lambda', 'Name', 'Attribute', 'Subscript', 'Slice', 'Starred', 'Constant',
+                 'JoinedStr', 'FormattedValue', 'List', 'Tuple', 'Dict', 'Set', 'ListComp', 'SetComp', 'DictComp',
+                 'GeneratorExp', 'comprehension', 'Call', 'keyword', 'BinOp', 'UnaryOp', 'BoolOp', 'Compare',
+                 'IfExp', 'operator', 'unaryop', 'boolop', 'cmpop', 'expr_context'}
+
+# Compiled scripts (or None when they must run in a subprocess), keyed by (filename, sha256)
+sandboxed_scripts = {}
+# sys.argv and the standard streams are process wide, so only one script runs in-process at a time
+inprocess_lock = threading.Lock()
+
+def sandboxable(tree):
+    """Check that a parsed script only prints, loops and uses sys.argv/sys.exit
+
+    Only the node types in SANDBOX_NODES are accepted, and no dunder names but
+    __name__, so a script cannot reach the checker through __builtins__,
+    __class__, __globals__ and the like.
+    """
+    import ast
+    for node in ast.walk(tree):
+        # Operators and the Load/Store contexts are allowed by their base class, e.g. Add by operator
+        if not any(cls.__name__ in SANDBOX_NODES for cls in type(node).__mro__):
+            return False
+        names = [getattr(node, field, None) for field in ('id', 'attr', 'name', 'arg')]
+        if any(isinstance(name, str) and name.startswith('__') and name not in SANDBOX_DUNDERS for name in names):
+            return False
+        if isinstance(node, ast.Import) and any(alias.name not in SANDBOX_MODULES or alias.asname for alias in node.names):
+            return False
+        if isinstance(node, ast.Attribute):
+            if isinstance(node.value, ast.Name) and node.value.id == 'sys' and node.attr not in SANDBOX_SYS_NAMES:
+                return False
+        if isinstance(node, ast.Name) and node.id in SANDBOX_UNSAFE_CALLS:
+            return False
+    return True
+
+def sandboxed_code(filename, digest):
+    """Compile a student script once for in-process runs, or return None if it needs a subprocess"""
+    import ast
+    # The interpreter reports the main script joined to the working directory, without normalising it
+    path = os.path.join(os.getcwd(), filename)
+    key = (path, digest)
+    if key not in sandboxed_scripts:
+        try:
+            with open(path, 'rb') as f:
+                tree = ast.parse(f.read(), path)
+            code = compile(tree, path, 'exec') if sandboxable(tree) else None
+        except (OSError, SyntaxError, ValueError):
+            # Let the real interpreter report missing files and syntax errors
+            code = None
+        sandboxed_scripts[key] = code
+    return sandboxed_scripts[key]
+
+def exit_status(code, err):
+    """Turn a SystemExit code into the status the interpreter would exit with"""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code & 0xff
+    print(code, file=err)
+    return 1
+
+def deadline_tracer(deadline):
+    """A sys.settrace function that stops the traced script once time.monotonic() passes deadline"""
+    def trace(frame, event, arg):
+        if time.monotonic() > deadline:
+            raise ProgramTimeout()
+        return trace
+    return trace
+
+def exec_with_deadline(code, namespace):
+    if TIMEOUT:
+        sys.settrace(deadline_tracer(time.monotonic() + TIMEOUT))
+    try:
+        exec(code, namespace)
+    finally:
+        sys.settrace(None)
+
+def run_inprocess(code, args, stdin, profile=None):
+    """Run a compiled script in a fresh namespace with its own argv and standard streams"""
+    import builtins
+    import io
+    import traceback
+    if profile is not None:
+        profile.update(engine='inprocess', spawn=0.0, cpu=None, max_rss_kb=None)
+    stdout = io.BytesIO()
+    stderr = io.BytesIO()
+    out = io.TextIOWrapper(stdout, encoding='utf-8', write_through=True)
+    err = io.TextIOWrapper(stderr, encoding='utf-8', write_through=True)
+    namespace = {'__name__': '__main__', '__file__': code.co_filename, '__builtins__': dict(vars(builtins))}
+    with inprocess_lock:
+        saved = sys.argv, sys.stdin, sys.stdout, sys.stderr
+        sys.argv = list(args)
+        sys.stdin = io.TextIOWrapper(io.BytesIO(stdin), encoding='utf-8')
+        sys.stdout, sys.stderr = out, err
+        try:
+            exec_with_deadline(code, namespace)
+            return_code = 0
+        except ProgramTimeout:
+            return_code = None
+        except SystemExit as e:
+            return_code = exit_status(e.code, err)
+        except BaseException as e:
+            # Same report as the interpreter, without the frames of this function and exec_with_deadline;
+            # a script raising KeyboardInterrupt or the like fails its tests rather than stopping the checker
+            traceback.print_exception(type(e), e, e.__traceback__.tb_next.tb_next, file=err)
+            return_code = 1
+        finally:
+            sys.argv, sys.stdin, sys.stdout, sys.stderr = saved
+    out.flush()
+    err.flush()
+    return stdout.getvalue(), stderr.getvalue(), return_code
+
+# Program run by each warm interpreter in a zygote pool. It reads length-prefixed pickled
+# (cwd, argv, stdin, rlimits, timeout) requests from its stdin, forks a child that runs the
+# script the way the interpreter itself would, and writes back a pickled (stdout, stderr,
+# status, (cpu seconds, max rss kB)), with a status of None when the child was killed for
+# running past the timeout. The usage comes from wait4, so it is the child's own.
+ZYGOTE_SOURCE = r"""
+import builtins, os, pickle, resource, select, signal, struct, sys, tempfile, traceback
+import argparse, collections, datetime, io, math, random, re, string, subprocess, time
+
+def run_child(cwd, args):
+    os.chdir(cwd)
+    sys.stdin = open(0, 'r', closefd=False)
+    sys.stdout = open(1, 'w', closefd=False)
+    sys.stderr = open(2, 'w', closefd=False)
+    sys.argv = list(args)
+    path = os.path.join(cwd, args[0])
+    sys.path[0] = os.path.dirname(path)
+    try:
+        with open(path, 'rb') as f:
+            source = f.read()
+    except OSError as e:
+        print(f"{sys.executable}: can't open file {path!r}: [Errno {e.errno}] {e.strerror}", file=sys.stderr)
+        return 2
+    try:
+        exec(compile(source, path, 'exec'), {'__name__': '__main__', '__file__': path, '__builtins__': builtins})
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code & 0xff
+        print(e.code, file=sys.stderr)
+        return 1
+    except SyntaxError as e:
+        traceback.print_exception(type(e), e, None)
+        return 1
+    except BaseException as e:
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        return 1
+    return 0
+
+def wait_pidfd(pid, timeout):
+    # Whether the child exited within timeout, or None when there are no pidfds (Linux before 5.3)
+    try:
+        fd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        return None
+    try:
+        return bool(select.select([fd], [], [], timeout)[0])
+    finally:
+        os.close(fd)
+
+def wait_child(pid, timeout):
+    result = None
+    exited = True
+    if timeout:
+        exited = wait_pidfd(pid, timeout)
+        if exited is None:
+            # Poll without blocking instead, backing off from 0.5 ms to 10 ms between tries
+            deadline = time.monotonic() + timeout
+            delay = 0.0005
+            result = os.wait4(pid, os.WNOHANG)
+            while not result[0] and time.monotonic() < deadline:
+                time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+                delay = min(delay * 2, 0.01)
+                result = os.wait4(pid, os.WNOHANG)
+            exited = bool(result[0])
+        if not exited:
+            os.killpg(pid, signal.SIGKILL)
+    if not result or not result[0]:
+        result = os.wait4(pid, 0)
+    _, status, usage = result
+    usage = (usage.ru_utime + usage.ru_stime, usage.ru_maxrss)
+    if not exited:
+        return None, usage
+    return os.waitstatus_to_exitcode(status), usage
+
+requests = sys.stdin.buffer
+responses = sys.stdout.buffer
+# Tell the checker this interpreter is warm
+responses.write(b'R')
+responses.flush()
+while True:
+    header = requests.read(4)
+    if len(header) < 4:
+        break
+    cwd, args, data, limits, timeout = pickle.loads(requests.read(struct.unpack('<I', header)[0]))
+    with tempfile.TemporaryFile() as fin, tempfile.TemporaryFile() as fout, tempfile.TemporaryFile() as ferr:
+        fin.write(data)
+        fin.seek(0)
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                os.setsid()
+                for limit, value in limits:
+                    resource.setrlimit(limit, (value, value))
+                os.dup2(fin.fileno(), 0)
+                os.dup2(fout.fileno(), 1)
+                os.dup2(ferr.fileno(), 2)
+                status = run_child(cwd, args)
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(status)
+        status, usage = wait_child(pid, timeout)
+        fout.seek(0)
+        ferr.seek(0)
+        response = pickle.dumps((fout.read(), ferr.read(), status, usage))
+    responses.write(struct.pack('<I', len(response)) + response)
+    responses.flush()
+"""
+
+class Zygote:
+    """A warm interpreter that forks a fresh child for each student program sent to it"""
+
+    def __init__(self, interpreter):
+        import subprocess
+        self.process = subprocess.Popen([interpreter, '-c', ZYGOTE_SOURCE], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        if self.process.stdout.read(1) != b'R':
+            self.kill()
+            raise EOFError('zygote did not start')
+
+    def send(self, args, stdin):
+        import pickle
+        import struct
+        request = pickle.dumps((os.getcwd(), list(args), stdin, resource_limits(), TIMEOUT))
+        self.process.stdin.write(struct.pack('<I', len(request)) + request)
+        self.process.stdin.flush()
+
+    def receive(self):
+        import pickle
+        import struct
+        header = self.process.stdout.read(4)
+        if len(header) < 4:
+            raise EOFError('zygote exited')
+        return pickle.loads(self.process.stdout.read(struct.unpack('<I', header)[0]))
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+        self.process.stdout.close()
+
+    def kill(self):
+        """Stop a zygote that failed, reaping it and closing its pipes"""
+        self.process.kill()
+        self.process.wait()
+        for pipe in (self.process.stdin, self.process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+class ZygotePool:
+    """Up to size warm interpreters for one interpreter path, started as they are needed"""
+
+    def __init__(self, interpreter, size):
+        import queue
+        self.interpreter = interpreter
+        self.idle = queue.LifoQueue()
+        self.slots = threading.Semaphore(size)
+        self.zygotes = []
+
+    def run(self, args, stdin, profile=None):
+        import queue
+        profile = {} if profile is None else profile
+        with self.slots:
+            start = time.perf_counter()
+            try:
+                zygote = self.idle.get_nowait()
+            except queue.Empty:
+                zygote = None
+            try:
+                if zygote is None:
+                    zygote = Zygote(self.interpreter)
+                    self.zygotes.append(zygote)
+                zygote.send(args, stdin)
+                # Spawn covers starting a zygote when none is idle and handing it the request
+                profile.update(engine='zygote', spawn=time.perf_counter() - start)
+                stdout, err, status, (profile['cpu'], profile['max_rss_kb']) = zygote.receive()
+            except (OSError, EOFError):
+                # The zygote died or would not start; drop it and fall back to a cold start for this program
+                if zygote is not None:
+                    self.zygotes.remove(zygote)
+                    zygote.kill()
+                return run_subprocess(args, stdin, self.interpreter, profile)
+            self.idle.put(zygote)
+            return stdout, err, status
+
+    def close(self):
+        for zygote in self.zygotes:
+            zygote.close()
+        self.zygotes = []
+
+# One pool per interpreter, sized by --jobs
+zygote_pools = {}
+zygote_pools_lock = threading.Lock()
+
+def zygote_pool(interpreter):
+    with zygote_pools_lock:
+        if interpreter not in zygote_pools:
+            zygote_pools[interpreter] = ZygotePool(interpreter, max(1, ParallelTextTestRunner.jobs))
+        return zygote_pools[interpreter]
+
+@atexit.register
+def close_zygote_pools():
+    for pool in zygote_pools.values():
+        pool.close()
+
+# One row of a lab's spec table; argv is a space separated command line and requires the
+# space separated names of tests that must pass first. check says what is compared with expected:
+#   'exists'      the file argv[0] exists (expected is unused)
+#   'returncode'  running argv with stdin exits with status expected
+#   'stdout'      running argv with stdin prints exactly the bytes expected
+#   'shebang'     the first line of argv[0] is expected, compared stripped unless expected ends in a newline
+#   'contains'    if the file argv[0] exists, its text contains expected
+Spec = namedtuple('Spec', 'test description check argv stdin expected hint requires', defaults=('',))
+# A TestCase class to build: its name, docstring, the start of every test docstring, and its spec rows
+Lab = namedtuple('Lab', 'name doc prefix specs')
+
+def check_exists(case, spec):
+    case.assertTrue(os.path.exists(spec.argv[0]), msg=spec.hint)
+
+def check_returncode(case, spec):
+    _, _, return_code = run_program(spec.argv, stdin=spec.stdin)
+    case.assertEqual(return_code, spec.expected, msg=spec.hint)
+
+def check_stdout(case, spec):
+    stdout, _, _ = run_program(spec.argv, stdin=spec.stdin)
+    case.assertEqual(stdout, spec.expected, msg=spec.hint)
+
+def check_shebang(case, spec):
+    with open(spec.argv[0]) as lab_file:
+        first_line = lab_file.readline()
+    if not spec.expected.endswith('\n'):
+        first_line = first_line.strip()
+    case.assertEqual(first_line, spec.expected, msg=spec.hint)
+
+def check_contains(case, spec):
+    if os.path.exists(spec.argv[0]):
+        with open(spec.argv[0]) as f:
+            case.assertIn(spec.expected, f.read(), msg=spec.hint)
+
+CHECKS = {'exists': check_exists, 'returncode': check_returncode, 'stdout': check_stdout,
+          'shebang': check_shebang, 'contains': check_contains}
+# The checks that run the student program
+RUN_CHECKS = {'returncode', 'stdout'}
+
+def failed_prerequisites(case, spec):
+    """The chain of prerequisites from spec down to the first one that fails, or an empty list
+
+    Prerequisites are checked again rather than looked up, which is cheap: an
+    exists check is a stat and a run comes from the run cache.
+    """
+    for name in spec.requires:
+        required = case.specs[name]
+        chain = failed_prerequisites(case, required)
+        if chain:
+            return [required] + chain
+        try:
+            CHECKS[required.check](case, required)
+        except Exception:
+            return [required]
+    return []
+
+def spec_test(spec, doc):
+    def test(self):
+        chain = failed_prerequisites(self, spec)
+        if chain:
+            self.skipTest('requires ' + ' -> '.join(required.test for required in chain) + ', which failed: ' + chain[-1].description)
+        CHECKS[spec.check](self, spec)
+    test.__name__ = spec.test
+    test.__doc__ = doc
+    return test
+
+def build_tests(module, labs):
+    """Build a TestCase class for each Lab, returned as {name: class} for the checker's namespace
+
+    The classes claim module as their home so test ids read like the checker's
+    own, e.g. __main__.lab2a.test_0.
+    """
+    classes = {}
+    for lab in labs:
+        specs = {}
+        for row in lab.specs:
+            spec = Spec(*row)
+            specs[spec.test] = spec._replace(argv=tuple(spec.argv.split()), requires=tuple(spec.requires.split()))
+        namespace = {'__module__': module, '__doc__': lab.doc, 'specs': specs,
+                     'lab_file': next(iter(specs.values())).argv[0]}
+        for spec in specs.values():
+            namespace[spec.test] = spec_test(spec, lab.prefix + spec.description)
+        classes[lab.name] = type(lab.name, (unittest.TestCase,), namespace)
+    return classes
+
+def planned_runs(tests):
+    """The unique (argv, stdin) runs the tests will ask for, grouped by script in order of first use
+
+    Missing scripts are left out; their tests are skipped by the exists prerequisite.
+    """
+    runs = {}
+    for test in tests:
+        spec = getattr(test, 'specs', {}).get(test._testMethodName)
+        if spec and spec.check in RUN_CHECKS and os.path.exists(spec.argv[0]):
+            runs.setdefault(spec.argv[0], {}).setdefault((spec.argv, spec.stdin))
+    return [run for script in runs.values() for run in script]
+
+class RecordedResult(unittest.TestResult):
+    """Keep the outcome of a single test so it can be reported later, in order"""
+
+    def __init__(self):
+        super().__init__()
+        self.outcome = ('addSuccess',)
+
+    def addFailure(self, test, err):
+        self.outcome = ('addFailure', self._exc_info_to_string(err, test))
+
+    def addError(self, test, err):
+        self.outcome = ('addError', self._exc_info_to_string(err, test))
+
+    def addSkip(self, test, reason):
+        self.outcome = ('addSkip', reason)
+
+    def addExpectedFailure(self, test, err):
+        self.outcome = ('addExpectedFailure', self._exc_info_to_string(err, test))
+
+    def addUnexpectedSuccess(self, test):
+        self.outcome = ('addUnexpectedSuccess',)
+
+class ReplayTextTestResult(unittest.TextTestResult):
+    """TextTestResult that also accepts tracebacks already formatted by RecordedResult"""
+
+    def _exc_info_to_string(self, err, test):
+        if isinstance(err, str):
+            return err
+        return super()._exc_info_to_string(err, test)
+
+class StructuredTestResult(ReplayTextTestResult):
+    """Collect one record per test for machines instead of unittest's text report
+
+    Records are written to output, which is bound before any test runs so that
+    in-process student programs swapping sys.stdout cannot capture them.
+    """
+    output = None
+
+    def __init__(self, stream, descriptions, verbosity):
+        super().__init__(stream, descriptions, 0)
+        self.records = []
+
+    def outcome(self, test, outcome, message=''):
+        test_id = test.id().split('.', 1)[-1]
+        timings = test_timings.get(test.id())
+        record = {'id': test_id, 'description': test.shortDescription(), 'outcome': outcome, 'message': message,
+                  'duration': timings and round(timings[0], 6), 'program_seconds': timings and round(timings[1], 6),
+                  'cached': timings is None}
+        self.records.append(record)
+        self.emit(record)
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self.outcome(test, 'success')
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self.outcome(test, 'failure', self.failures[-1][1])
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self.outcome(test, 'error', self.errors[-1][1])
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self.outcome(test, 'skipped', reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self.outcome(test, 'expected_failure', self.expectedFailures[-1][1])
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self.outcome(test, 'unexpected_success')
+
+    def emit(self, record):
+        pass
+
+    def printErrors(self):
+        pass
+
+class JSONLinesTestResult(StructuredTestResult):
+    """Write each test's record as a JSON line the moment it is reported"""
+
+    def emit(self, record):
+        import json
+        self.output.write(json.dumps(record) + '\n')
+        self.output.flush()
+
+class JUnitTestResult(StructuredTestResult):
+    """Write all the records as one JUnit XML document at the end of the run"""
+
+    def printErrors(self):
+        import xml.etree.ElementTree as ET
+        root = ET.Element('testsuites')
+        suites = {}
+        for record in self.records:
+            classname, name = record['id'].rsplit('.', 1)
+            if classname not in suites:
+                suites[classname] = ET.SubElement(root, 'testsuite', name=classname)
+            case = ET.SubElement(suites[classname], 'testcase', classname=classname, name=name, time=f"{record['duration'] or 0:.3f}")
+            properties = ET.SubElement(case, 'properties')
+            for key in ('description', 'program_seconds', 'cached'):
+                ET.SubElement(properties, 'property', name=key, value=str(record[key]))
+            tag = {'failure': 'failure', 'unexpected_success': 'failure', 'error': 'error', 'skipped': 'skipped'}.get(record['outcome'])
+            if tag:
+                message = record['message'].strip().splitlines()[-1] if record['message'].strip() else record['outcome']
+                ET.SubElement(case, tag, message=message).text = record['message']
+        for element in [root] + list(suites.values()):
+            cases = element.findall('.//testcase')
+            element.set('tests', str(len(cases)))
+            for tag, key in (('failure', 'failures'), ('error', 'errors'), ('skipped', 'skipped')):
+                element.set(key, str(sum(case.find(tag) is not None for case in cases)))
+            element.set('time', f"{sum(float(case.get('time')) for case in cases):.3f}")
+        ET.indent(root)
+        self.output.write(ET.tostring(root, encoding='unicode', xml_declaration=True) + '\n')
+        self.output.flush()
+
+RESULT_CLASSES = {'jsonl': JSONLinesTestResult, 'junit': JUnitTestResult}
+
+def iter_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_tests(test)
+        else:
+            yield test
+
+# (test seconds, student program seconds, seconds waited in run_program) of every test that
+# ran rather than coming from the result cache, by test id
+test_timings = {}
+
+def run_recorded(test):
+    result = RecordedResult()
+    program_time.seconds = 0.0
+    program_time.waited = 0.0
+    start = time.perf_counter()
+    test(result)
+    test_timings[test.id()] = (time.perf_counter() - start, program_time.seconds, program_time.waited)
+    return result.outcome
+
+def lab_file(cls):
+    """The student file a TestCase class checks, e.g. ./lab2a.py for lab2a"""
+    return getattr(cls, 'lab_file', './' + cls.__name__ + '.py')
+
+class ResultCache:
+    """Test outcomes kept on disk between runs, least recently used evicted first
+
+    Each TestCase class gets one JSON file of {test id: outcome}, named by the
+    sha256 of the checker and this engine, the class, the file it checks and
+    the options that can change an outcome, so editing the lab, the spec
+    table or the engine misses.
+    """
+
+    def __init__(self, directory, max_bytes, checker):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.checker_digest = (file_digest(checker), file_digest(__file__))
+
+    def path(self, cls):
+        import hashlib
+        key = hashlib.sha256()
+        for part in (self.checker_digest, cls.__qualname__, file_digest(lab_file(cls)), PYTHON, TIMEOUT, CPU_LIMIT, MEM_LIMIT):
+            key.update(repr(part).encode('utf-8') + b'\0')
+        return os.path.join(self.directory, key.hexdigest() + '.json')
+
+    def load(self, cls):
+        import json
+        path = self.path(cls)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            # Reading counts as a use for the eviction order
+            os.utime(path)
+        except (OSError, ValueError):
+            return {}
+        return entry
+
+    def outcomes(self, tests):
+        """The cached outcomes of tests, for every class whose selected tests are all cached"""
+        found = {}
+        for cls in dict.fromkeys(type(test) for test in tests):
+            entry = self.load(cls)
+            group = [test for test in tests if type(test) is cls]
+            if all(test.id() in entry for test in group):
+                found.update((test, tuple(entry[test.id()])) for test in group)
+        return found
+
+    def store(self, outcomes):
+        """Save the outcomes of tests that just ran, leaving out classes with errors or timeouts"""
+        import json
+        for cls in dict.fromkeys(type(test) for test in outcomes):
+            group = {test.id(): outcome for test, outcome in outcomes.items() if type(test) is cls}
+            if any(outcome[0] == 'addError' or 'ProgramTimeout:' in outcome[-1] for outcome in group.values()):
+                continue
+            entry = self.load(cls)
+            entry.update(group)
+            path = self.path(cls)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                temp = f'{path}.{os.getpid()}.{threading.get_ident()}'
+                with open(temp, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f)
+                os.replace(temp, path)
+            except OSError:
+                return
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+# Where test outcomes are cached between runs; None when --no-cache is given
+result_cache = None
+
+def recorded_outcomes(tests, jobs=1):
+    """Yield (test, outcome) in order, from the result cache where possible and otherwise by running the test"""
+    cached = result_cache.outcomes(tests) if result_cache else {}
+    pending = [test for test in tests if test not in cached]
+    ran = {}
+    # Every test waits on its own student program, so they can run side by side
+    from concurrent.futures import ThreadPoolExecutor
+    pool = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        if pool:
+            # Queue every unique run first, so no test's program waits behind the tests ahead of it
+            for args, stdin in planned_runs(pending):
+                pool.submit(run_program, args, stdin)
+        outcomes = pool.map(run_recorded, pending) if pool else map(run_recorded, pending)
+        for test in tests:
+            if test in cached:
+                yield test, cached[test]
+            else:
+                ran[test] = next(outcomes)
+                yield test, ran[test]
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+        if result_cache and ran:
+            result_cache.store(ran)
+
+class ParallelTextTestRunner(unittest.TextTestRunner):
+    """Run the tests on a pool of threads and report them in the usual order with the usual text"""
+    resultclass = ReplayTextTestResult
+    jobs = 1
+
+    def run(self, test, outcomes=None):
+        """Run test, or report outcomes instead if given: a generator of (test, outcome) like recorded_outcomes()"""
+        if outcomes is None:
+            outcomes = recorded_outcomes(list(iter_tests(test)), self.jobs)
+        return super().run(lambda result: self.replay(result, outcomes))
+
+    def replay(self, result, outcomes):
+        try:
+            for test, outcome in outcomes:
+                result.startTest(test)
+                getattr(result, outcome[0])(test, *outcome[1:])
+                result.stopTest(test)
+                if result.shouldStop:
+                    break
+        finally:
+            outcomes.close()
+
+def lab_files(module):
+    """Names of the lab scripts checked by the TestCase classes in module, e.g. lab2a.py"""
+    return sorted(os.path.basename(lab_file(value)) for value in vars(module).values()
+                  if isinstance(value, type) and issubclass(value, unittest.TestCase))
+
+def find_lab_directories(root, filenames):
+    """Yield every directory under root that holds at least one of the lab scripts"""
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs if not d.startswith('.'))
+        if any(name in files for name in filenames):
+            subdirs[:] = []
+            yield directory
+
+def grade_directory(directory, names):
+    """Run the checks against one lab directory and summarise the outcome (runs in a worker process)"""
+    start = time.time()
+    os.chdir(directory)
+    module = sys.modules['__main__']
+    loader = unittest.defaultTestLoader
+    suite = loader.loadTestsFromNames(names, module) if names else loader.loadTestsFromModule(module)
+    counts = {'passed': 0, 'failures': 0, 'errors': 0, 'skipped': 0}
+    failed = []
+    timeouts = 0
+    for test, (outcome, *details) in recorded_outcomes(list(iter_tests(suite))):
+        if outcome in ('addSuccess', 'addExpectedFailure'):
+            counts['passed'] += 1
+        elif outcome == 'addSkip':
+            counts['skipped'] += 1
+        else:
+            counts['errors' if outcome == 'addError' else 'failures'] += 1
+            failed.append(test.id().split('.', 1)[-1])
+            timeouts += any('ProgramTimeout:' in detail for detail in details)
+    return dict(tests=sum(counts.values()), **counts, timeouts=timeouts, failed=failed, seconds=round(time.time() - start, 3))
+
+def grade_batch(root, argv, jobs):
+    """Grade every lab directory under root on a pool of worker processes, one JSON line per directory"""
+    import json
+    names = [arg for arg in argv[1:] if not arg.startswith('-')]
+    directories = list(find_lab_directories(root, lab_files(sys.modules['__main__'])))
+    # Forked workers share this already loaded checker and its unittest machinery
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    context = multiprocessing.get_context('fork')
+    all_passed = True
+    with ProcessPoolExecutor(max_workers=max(1, jobs), mp_context=context) as pool:
+        futures = {pool.submit(grade_directory, os.path.abspath(directory), names): directory for directory in directories}
+        for future in as_completed(futures):
+            relative = os.path.relpath(futures[future], root)
+            record = {'student': relative.split(os.sep)[0], 'directory': relative}
+            try:
+                record.update(future.result())
+            except Exception as e:
+                record['error'] = repr(e)
+            all_passed = all_passed and not record.get('error') and not record.get('failed')
+            print(json.dumps(record), flush=True)
+    return 0 if all_passed else 1
+
+def watched_files(cls):
+    """The files whose contents decide a TestCase class's outcomes: its lab file and every script it runs"""
+    return {lab_file(cls)} | {spec.argv[0] for spec in getattr(cls, 'specs', {}).values()}
+
+def forget_runs(digest):
+    """Drop the cached runs and compiled code of a script version that has been replaced"""
+    with run_cache_lock:
+        for key in [key for key in run_cache if key[0] == digest]:
+            del run_cache[key]
+    for key in [key for key in sandboxed_scripts if key[1] == digest]:
+        del sandboxed_scripts[key]
+
+class FileWatcher:
+    """Tell which of a set of files changed content since the last poll
+
+    A poll is one stat per file; a file is only hashed when its mtime or size
+    moved, so saving without changes (or touching a file) reruns nothing.
+    """
+
+    def __init__(self, filenames):
+        # filename: ((mtime, size) or None if missing, sha256 or None), or None before the first poll
+        self.seen = dict.fromkeys(sorted(filenames))
+
+    def changed(self):
+        changed = []
+        for filename, seen in self.seen.items():
+            try:
+                stat = os.stat(filename)
+                signature = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                signature = None
+            if seen and seen[0] == signature:
+                continue
+            digest = file_digest(filename) if signature else None
+            self.seen[filename] = (signature, digest)
+            if not seen or seen[1] != digest:
+                changed.append(filename)
+                if seen and seen[1]:
+                    forget_runs(seen[1])
+        return changed
+
+def recording(tests, jobs, outcomes):
+    """recorded_outcomes(), also saving each outcome in outcomes as it is reported"""
+    recorded = recorded_outcomes(tests, jobs)
+    try:
+        for test, outcome in recorded:
+            outcomes[test] = outcome
+            yield test, outcome
+    finally:
+        recorded.close()
+
+def watch_summary(tests, outcomes):
+    """One line on where every test stands, whether or not it ran this time"""
+    counts = {'passed': 0, 'skipped': 0, 'not run': 0}
+    failing = []
+    for test in tests:
+        outcome = outcomes.get(test, ('',))[0]
+        if outcome in ('addSuccess', 'addExpectedFailure'):
+            counts['passed'] += 1
+        elif outcome == 'addSkip':
+            counts['skipped'] += 1
+        elif outcome:
+            failing.append(test.id().split('.', 1)[-1])
+        else:
+            counts['not run'] += 1
+    summary = ', '.join(f'{count} {name}' for name, count in counts.items() if count)
+    if failing:
+        summary += f", {len(failing)} failing: " + ' '.join(failing)
+    return f'All {len(tests)} tests: {summary}'
+
+def watch(tests, runner, interval, stream=sys.stderr):
+    """Rerun the tests of each class whose files change, every interval seconds, until interrupted
+
+    Outcomes of the classes that did not change stay in memory, so each round
+    only reports the tests it reran plus a one line summary of all of them.
+    Returns whether the last outcome of every test passed or was skipped.
+    """
+    files = {cls: watched_files(cls) for cls in dict.fromkeys(type(test) for test in tests)}
+    watcher = FileWatcher(set().union(*files.values()))
+    outcomes = {}
+    rounds = 0
+    try:
+        while True:
+            changed = set(watcher.changed())
+            dirty = [test for test in tests if files[type(test)] & changed]
+            if dirty:
+                classes = ' '.join(cls.__name__ for cls in dict.fromkeys(type(test) for test in dirty))
+                if rounds:
+                    print(f"\n[{time.strftime('%H:%M:%S')}] {' '.join(sorted(changed))} changed, rerunning {classes}", file=stream)
+                for test in dirty:
+                    outcomes.pop(test, None)
+                runner.run(unittest.TestSuite(dirty), recording(dirty, runner.jobs, outcomes))
+                print(watch_summary(tests, outcomes), file=stream)
+                print(f'Watching {len(watcher.seen)} files for changes, Ctrl-C to stop', file=stream, flush=True)
+                rounds += 1
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print(file=stream)
+    return all(outcomes.get(test, ('',))[0] in ('addSuccess', 'addExpectedFailure', 'addSkip') for test in tests)
+
+class WatchingTestProgram(unittest.TestProgram):
+    """unittest.main that keeps rerunning the selected tests as their files change, for --watch"""
+    interval = 0.25
+
+    def runTests(self):
+        runner = ParallelTextTestRunner(verbosity=self.verbosity, failfast=self.failfast, buffer=self.buffer, warnings=self.warnings)
+        self.passed = watch(list(iter_tests(self.test)), runner, self.interval, runner.stream)
+
+def profile_summary(wall):
+    """Totals for --profile, summed over threads: time student programs ran against time spent around them"""
+    spawn = sum(profile['spawn'] for profile in program_profiles)
+    useful = sum(profile['run'] for profile in program_profiles) - spawn
+    checker = sum(seconds - waited for seconds, _, waited in test_timings.values())
+    return {'wall': wall, 'tests': len(test_timings), 'programs': len(program_profiles),
+            'useful': useful, 'spawn': spawn, 'checker': checker, 'overhead': spawn + checker}
+
+def profile_report(wall, stream, top=10):
+    """Print the slowest tests and programs and where the wall time went"""
+    summary = profile_summary(wall)
+    print('Profile', file=stream)
+    print('=' * 70, file=stream)
+    print(f"{summary['tests']} tests ran in {wall:.3f} s with {summary['programs']} program runs", file=stream)
+    print(f"  useful work (child run time):  {summary['useful']:8.3f} s", file=stream)
+    print(f"  overhead:                      {summary['overhead']:8.3f} s  (spawning {summary['spawn']:.3f} s,"
+          f" checker code {summary['checker']:.3f} s, {summary['overhead'] / (summary['useful'] or 1):.0%} of useful work)", file=stream)
+    print('Slowest tests (seconds, of which in programs):', file=stream)
+    for test_id, (seconds, in_programs, _) in sorted(test_timings.items(), key=lambda item: -item[1][0])[:top]:
+        print(f"  {seconds:8.4f} {in_programs:8.4f}  {test_id.split('.', 1)[-1]}", file=stream)
+    print('Slowest programs (run, spawn, cpu seconds, max RSS, output bytes, status):', file=stream)
+    for profile in sorted(program_profiles, key=lambda profile: -profile['run'])[:top]:
+        cpu = '-' if profile['cpu'] is None else f"{profile['cpu']:.3f}"
+        rss = '-' if profile['max_rss_kb'] is None else f"{profile['max_rss_kb'] / 1024:.1f}M"
+        print(f"  {profile['run']:8.4f} {profile['spawn']:8.4f} {cpu:>7} {rss:>7} {profile['stdout_bytes'] + profile['stderr_bytes']:7d}"
+              f"  {profile['status']!s:>4}  {profile['engine']:<10} {profile['args']}", file=stream)
+
+def write_profile(path, wall):
+    """Dump the profile as one JSON document, for tracking it over time"""
+    import json
+    document = {'checker': CHECKER, 'when': time.time(), 'engine': ENGINE, 'jobs': ParallelTextTestRunner.jobs,
+                'summary': profile_summary(wall),
+                'tests': [{'id': test_id.split('.', 1)[-1], 'seconds': seconds, 'program_seconds': in_programs, 'waited': waited}
+                          for test_id, (seconds, in_programs, waited) in test_timings.items()],
+                'programs': program_profiles}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=1)
+
+def parse_checker_args(argv):
+    """Split this checker's own options from the ones handed to unittest.main"""
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument('-j', '--jobs', type=int, default=1)
+    parser.add_argument('--batch', metavar='ROOT')
+    parser.add_argument('--engine', choices=['subprocess', 'zygote', 'inprocess'], default='subprocess')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, metavar='SECONDS')
+    parser.add_argument('--cpu-limit', type=int, metavar='SECONDS')
+    parser.add_argument('--mem-limit', type=int, metavar='MB')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--cache-dir', default=os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'ops445-checklab'))
+    parser.add_argument('--cache-size', type=int, default=4, metavar='MB')
+    parser.add_argument('--update-url', default=UPDATE_URL, metavar='URL')
+    parser.add_argument('--no-update-check', action='store_true')
+    parser.add_argument('--format', choices=['text', 'jsonl', 'junit'], default='text')
+    parser.add_argument('--output', metavar='FILE')
+    parser.add_argument('--profile', action='store_true')
+    parser.add_argument('--profile-json', metavar='FILE')
+    parser.add_argument('--watch', action='store_true')
+    parser.add_argument('--watch-interval', type=float, default=WatchingTestProgram.interval, metavar='SECONDS')
+    options, remaining = parser.parse_known_args(argv[1:])
+    return options, argv[:1] + remaining
+
+def main(checker, lab, python=sys.executable):
+    """Run the checker for lab (e.g. 'CheckLab2.py', 'lab2') with the options in sys.argv"""
+    global PYTHON, CHECKER, LAB, ENGINE, TIMEOUT, CPU_LIMIT, MEM_LIMIT, result_cache
+    PYTHON = python
+    CHECKER = checker
+    LAB = lab
+    options, argv = parse_checker_args(sys.argv)
+    ParallelTextTestRunner.jobs = options.jobs
+    ENGINE = options.engine
+    TIMEOUT = options.timeout or None
+    CPU_LIMIT = options.cpu_limit
+    MEM_LIMIT = options.mem_limit
+    if not options.no_cache:
+        result_cache = ResultCache(os.path.join(options.cache_dir, 'results'), options.cache_size * 1024 * 1024,
+                                   sys.modules['__main__'].__file__)
+    if options.batch:
+        sys.exit(grade_batch(options.batch, argv, options.jobs))
+    update_check = None
+    if not options.no_update_check:
+        update_check = UpdateCheck(options.update_url, os.path.join(options.cache_dir, 'update-check.json'))
+        update_check.start()
+    # Keep stdout clean when the structured results are written to it
+    report_stream = sys.stdout
+    if options.format != 'text':
+        ParallelTextTestRunner.resultclass = RESULT_CLASSES[options.format]
+        StructuredTestResult.output = open(options.output, 'w', encoding='utf-8') if options.output else sys.stdout
+        if not options.output:
+            report_stream = sys.stderr
+
+    if len(argv) == 3 and report_stream is sys.stdout:
+        displayReportHeader()
+
+    start = time.perf_counter()
+    if options.watch:
+        WatchingTestProgram.interval = options.watch_interval
+        program = WatchingTestProgram(module='__main__', argv=argv, exit=False)
+        passed = program.passed
+    else:
+        program = unittest.main(module='__main__', argv=argv, testRunner=ParallelTextTestRunner, exit=False)
+        passed = program.result.wasSuccessful()
+    wall = time.perf_counter() - start
+    if options.profile:
+        profile_report(wall, sys.stderr)
+    if options.profile_json:
+        write_profile(options.profile_json, wall)
+    if update_check:
+        update_check.report(report_stream)
+    if options.output:
+        StructuredTestResult.output.close()
+    sys.exit(not passed)